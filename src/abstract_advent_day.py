@@ -1,7 +1,35 @@
+import functools
+import os
+import time
 import unittest
+import weakref
+
+from disk_cache import disk_cache
+from input_cache import input_cache
+from instrumentation import trace_memory
+from lazy_import import lazy_import
+from util import clear_memos, enter_memo_scope
+
+# Only needed when profiling
+cProfile = lazy_import('cProfile')
+pstats = lazy_import('pstats')
 
 type Answer = int | str | None
 
+profile_dir: str | None = os.environ.get('ADVENT_PROFILE') or None
+profile_top: int = int(os.environ.get('ADVENT_PROFILE_TOP', 20))
+
+def enable_profiling(directory: str | None, top: int = 20):
+    global profile_dir, profile_top
+    profile_dir, profile_top = directory, top
+
+    # Worker processes pick the setting up from the environment
+    if directory is None:
+        os.environ.pop('ADVENT_PROFILE', None)
+    else:
+        os.environ['ADVENT_PROFILE'] = directory
+        os.environ['ADVENT_PROFILE_TOP'] = str(top)
+
 def advent_info(day: int):
     def decorator(cls: AbstractAdventDay):
         cls.day = day
@@ -9,11 +37,74 @@ def advent_info(day: int):
 
     return decorator
 
-def expected_answers(example_answer: Answer | tuple[Answer, ...], answer: Answer | tuple[Answer, ...], disable: bool = False):
+def expected_answers(
+        example_answer: Answer | tuple[Answer, ...],
+        answer: Answer | tuple[Answer, ...],
+        disable: bool = False,
+        max_seconds: float | None = None,
+        max_mb: float | None = None,
+):
     def decorator(func: callable):
-        func.example_answer = example_answer
-        func.answer = answer
-        func.disable = disable
+        @functools.wraps(func)
+        def wrapper(self, *args):
+            if args:
+                enter_memo_scope(args[0])
+
+            if profile_dir is None:
+                return func(self, *args)
+
+            return self.profile(func, *args)
+
+        wrapper.example_answer = example_answer
+        wrapper.answer = answer
+        wrapper.disable = disable
+        wrapper.max_seconds = max_seconds
+        wrapper.max_mb = max_mb
+        return wrapper
+
+    return decorator
+
+# Results of stages per Data instance (by id), dropped when the Data instance is garbage collected
+stage_results: dict[int, dict[str, object]] = {}
+stage_dirs: dict[int, str] = {}
+
+def stage(func: callable):
+    # Derived result of the parsed input, computed once and shared by both puzzles.
+    # The Data class needs weakref_slot=True, so the results can be tied to its lifetime.
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(data):
+        key = id(data)
+
+        if key not in stage_results:
+            stage_results[key] = {}
+            weakref.finalize(data, forget_stages, key)
+
+        results = stage_results[key]
+
+        if name not in results:
+            # Stored in the disk cache entry of the input, so puzzles in other processes reuse it
+            if key in stage_dirs:
+                results[name] = disk_cache.get_stage(stage_dirs[key], name, lambda: func(data))
+            else:
+                results[name] = func(data)
+
+        return results[name]
+
+    return wrapper
+
+def clear_stages(data: object):
+    stage_results.pop(id(data), None)
+
+def forget_stages(key: int):
+    stage_results.pop(key, None)
+    stage_dirs.pop(key, None)
+
+def expected_complexity(exponent: float):
+    # Upper bound on the log-log slope of runtime against input size, checked by python -m complexity
+    def decorator(func: callable):
+        func.expected_exponent = exponent
         return func
 
     return decorator
@@ -27,14 +118,55 @@ class AbstractAdventDay(unittest.TestCase):
     ) -> None:
         super().__init__(method_name)
 
-    def read_example(self, example_index: int|None = None) -> object:
+    def example_path(self, example_index: int|None = None) -> str:
         if example_index is None:
-            return self.read(f'day{self.day}/input_example.txt')
+            return f'day{self.day}/input_example.txt'
         else:
-            return self.read(f'day{self.day}/input_example_{example_index}.txt')
+            return f'day{self.day}/input_example_{example_index}.txt'
+
+    def main_path(self) -> str:
+        return f'day{self.day}/input.txt'
+
+    def read_example(self, example_index: int|None = None) -> object:
+        return self.read_cached(self.example_path(example_index))
 
     def read_main(self) -> object:
-        return self.read(f'day{self.day}/input.txt')
+        return self.read_cached(self.main_path())
+
+    def read_cached(self, file_path: str) -> object:
+        self.input_name = os.path.splitext(os.path.basename(file_path))[0]
+
+        # Parsed inputs are shared between puzzles and test methods, so puzzles must not mutate them
+        return input_cache.get(type(self).__module__, file_path, self.read_persisted)
+
+    def read_persisted(self, file_path: str) -> object:
+        if disk_cache is None:
+            return self.read(file_path)
+
+        entry_dir = disk_cache.entry_dir(type(self), file_path)
+        data = disk_cache.get_entry(entry_dir, lambda: self.read(file_path))
+
+        if hasattr(data, '__weakref__'):
+            stage_dirs[id(data)] = entry_dir
+            weakref.finalize(data, forget_stages, id(data))
+
+        return data
+
+    def profile(self, func: callable, *args) -> Answer:
+        profiler = cProfile.Profile()
+        answer = profiler.runcall(func, self, *args)
+
+        name = f'day{self.day}_{func.__name__}_{getattr(self, 'input_name', 'input')}'
+        os.makedirs(profile_dir, exist_ok=True)
+        profiler.dump_stats(os.path.join(profile_dir, f'{name}.pstats'))
+
+        print(f'Profile of {name}:')
+        pstats.Stats(profiler).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(profile_top)
+
+        return answer
+
+    def invalidate_cache(self, file_path: str | None = None):
+        input_cache.invalidate(file_path, type(self).__module__)
 
     def test_puzzle_1_example(self):
         if self.puzzle_1.disable:
@@ -50,7 +182,7 @@ class AbstractAdventDay(unittest.TestCase):
         if self.puzzle_1.disable:
             return
 
-        self.assertEqual(self.puzzle_1.answer, self.puzzle_1(self.read_main()))
+        self.assert_answer_within_budget(self.puzzle_1, self.read_main())
 
     def test_puzzle_2_example(self):
         if self.puzzle_2.disable:
@@ -66,15 +198,74 @@ class AbstractAdventDay(unittest.TestCase):
         if self.puzzle_2.disable:
             return
 
-        self.assertEqual(self.puzzle_2.answer, self.puzzle_2(self.read_main()))
+        self.assert_answer_within_budget(self.puzzle_2, self.read_main())
+
+    def test_stream_example(self):
+        if not self.supports_streaming():
+            return
+
+        for i, puzzle in enumerate([self.puzzle_1, self.puzzle_2]):
+            if puzzle.disable:
+                continue
+
+            if isinstance(puzzle.example_answer, tuple):
+                for example_index, answer in enumerate(puzzle.example_answer, start=1):
+                    self.assertEqual(answer, self.solve_stream(self.example_path(example_index))[i])
+            else:
+                self.assertEqual(puzzle.example_answer, self.solve_stream(self.example_path())[i])
+
+    def test_stream_real(self):
+        if not self.supports_streaming():
+            return
+
+        answers = self.solve_stream(self.main_path())
+
+        for i, puzzle in enumerate([self.puzzle_1, self.puzzle_2]):
+            if not puzzle.disable:
+                self.assertEqual(puzzle.answer, answers[i])
+
+    def supports_streaming(self) -> bool:
+        return type(self).solve_stream is not AbstractAdventDay.solve_stream
+
+    def assert_answer_within_budget(self, puzzle: callable, data: object):
+        # The input can come from the cache, with stages and memos left behind by the other puzzle
+        clear_stages(data)
+        clear_memos(['input'])
+        start = time.perf_counter()
+        answer = puzzle(data)
+        seconds = time.perf_counter() - start
+
+        self.assertEqual(puzzle.answer, answer)
+
+        if puzzle.max_seconds is not None:
+            self.assertLessEqual(
+                seconds, puzzle.max_seconds,
+                f'{puzzle.__name__} took {seconds:.3f} s, budget is {puzzle.max_seconds} s',
+            )
+
+        # Traced in a separate run, since tracemalloc slows down the timed one
+        if puzzle.max_mb is not None:
+            clear_stages(data)
+            clear_memos(['input'])
+            _, usage = trace_memory(lambda: puzzle(data))
+            self.assertLessEqual(
+                usage.peak_mb, puzzle.max_mb,
+                f'{puzzle.__name__} peaked at {usage.peak_mb:.1f} MB, budget is {puzzle.max_mb} MB',
+            )
 
     def solve_puzzles(self):
-        print(f"Puzzle 1: {self.puzzle_1(self.read_main())}")
-        print(f"Puzzle 2: {self.puzzle_2(self.read_main())}")
+        data = self.read_main()
+
+        print(f"Puzzle 1: {self.puzzle_1(data)}")
+        print(f"Puzzle 2: {self.puzzle_2(data)}")
 
     def read(self, file_path: str) -> object:
         raise NotImplementedError
 
+    def solve_stream(self, file_path: str) -> tuple[Answer, Answer]:
+        # Optional: both answers from one pass over the file, for inputs that don't fit in memory
+        raise NotImplementedError
+
     @expected_answers(example_answer=None, answer=None)
     def puzzle_1(self, *args):
         raise NotImplementedError
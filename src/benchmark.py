@@ -0,0 +1,228 @@
+import argparse
+import json
+import math
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable
+
+from abstract_advent_day import clear_stages
+from days import discover_days, input_path, load_day
+from generators import GENERATORS, write_input
+from instrumentation import trace_memory
+from util import clear_memos, memo_stats
+
+STAGES = ('read', 'puzzle_1', 'puzzle_2')
+
+
+def time_call(func: Callable[[], object], repeat: int, warmup: int) -> list[float]:
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+
+    return samples
+
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'p95': percentile(samples, 0.95),
+        'runs': len(samples),
+    }
+
+
+def benchmark_day(day_number: int, file_path: str, repeat: int, warmup: int, memory: bool = False) -> dict[str, dict]:
+    day = load_day(day_number)
+
+    # Parse timings bypass the input cache, puzzle timings share one parsed input
+    results = {'read': summarize(time_call(lambda: day.read(file_path), repeat, warmup))}
+
+    if memory:
+        data, usage = trace_memory(lambda: day.read(file_path))
+        results['read']['memory'] = usage.as_dict()
+    else:
+        data = day.read(file_path)
+
+    for stage in STAGES[1:]:
+        puzzle = getattr(day, stage)
+
+        if puzzle.disable:
+            continue
+
+        # Stages and memos shared between the puzzles of an input are cleared, so every run does the full work
+        results[stage] = summarize(time_call(lambda: (clear_stages(data), clear_memos(['input']), puzzle(data)), repeat, warmup))
+
+        # Counters are taken from one run with all memos empty
+        clear_stages(data)
+        clear_memos(counters=True)
+        puzzle(data)
+        if stats := memo_stats():
+            results[stage]['memo'] = stats
+
+        # Traced separately, since tracemalloc slows down the timed runs
+        if memory:
+            clear_stages(data)
+            clear_memos(['input'])
+            _, usage = trace_memory(lambda: puzzle(data))
+            results[stage]['memory'] = usage.as_dict()
+
+    return results
+
+
+def run_benchmarks(
+        days: list[int],
+        repeat: int,
+        warmup: int,
+        example: bool,
+        memory: bool = False,
+        sizes: list[int] | None = None,
+        seed: int = 0,
+) -> dict:
+    results = {}
+
+    with tempfile.TemporaryDirectory() as generated_dir:
+        for day_number in days:
+            if sizes:
+                inputs = [
+                    (f'day{day_number}@{size}', write_input(day_number, size, generated_dir, seed))
+                    for size in sizes if day_number in GENERATORS
+                ]
+            else:
+                inputs = [(f'day{day_number}', input_path(day_number, example))]
+
+            for key, file_path in inputs:
+                if file_path is None:
+                    print(f'{key}: no input, skipped', file=sys.stderr)
+                    continue
+
+                results[key] = {'input': file_path, **benchmark_day(day_number, file_path, repeat, warmup, memory)}
+                print_day(key, results[key])
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'warmup': warmup,
+            'example': example,
+            'memory': memory,
+            'sizes': sizes,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def print_day(key: str, results: dict[str, dict]):
+    for stage in STAGES:
+        if stage not in results:
+            continue
+
+        timings = results[stage]
+        print(
+            f'{key:<10} {stage:<9}'
+            f' min {timings['min'] * 1000:10.3f} ms'
+            f'  median {timings['median'] * 1000:10.3f} ms'
+            f'  p95 {timings['p95'] * 1000:10.3f} ms'
+            + (f'  peak {timings['memory']['peak_bytes'] / 1024:10.1f} KiB' if 'memory' in timings else '')
+        )
+
+        for name, stats in timings.get('memo', {}).items():
+            print(
+                f'{'':<20} memo {name}: {stats['hits']} hits, {stats['misses']} misses,'
+                f' {stats['evictions']} evictions, {stats['size']} entries'
+            )
+
+
+def find_regressions(
+        current: dict,
+        baseline: dict,
+        threshold: float,
+        noise_floor: float,
+        memory_noise_floor: int,
+) -> list[str]:
+    regressions = []
+
+    for day_key, day_results in current['results'].items():
+        baseline_day = baseline['results'].get(day_key, {})
+
+        for stage in STAGES:
+            if stage not in day_results or stage not in baseline_day:
+                continue
+
+            now, before = day_results[stage]['median'], baseline_day[stage]['median']
+
+            if now > before * (1 + threshold) and now - before > noise_floor:
+                regressions.append(f'{day_key} {stage}: {before * 1000:.3f} ms -> {now * 1000:.3f} ms')
+
+            if 'memory' not in day_results[stage] or 'memory' not in baseline_day[stage]:
+                continue
+
+            now, before = day_results[stage]['memory']['peak_bytes'], baseline_day[stage]['memory']['peak_bytes']
+
+            if now > before * (1 + threshold) and now - before > memory_noise_floor:
+                regressions.append(f'{day_key} {stage}: peak {before / 1024:.1f} KiB -> {now / 1024:.1f} KiB')
+
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmark', description='Time parsing and solving of every day')
+    parser.add_argument('--days', type=int, nargs='*', help='days to run, all by default')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--example', action='store_true', help='use the example inputs')
+    parser.add_argument('--sizes', type=int, nargs='*', help='benchmark generated inputs of these sizes instead')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the generated inputs')
+    parser.add_argument('--memory', action='store_true', help='also record peak memory and allocation sites')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--compare', help='baseline JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed relative slowdown of the median')
+    parser.add_argument('--noise-floor', type=float, default=0.001, help='ignore slowdowns below this many seconds')
+    parser.add_argument('--memory-noise-floor', type=int, default=64 * 1024, help='ignore peak growth below this many bytes')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        args.days or discover_days(),
+        args.repeat,
+        args.warmup,
+        args.example,
+        args.memory,
+        args.sizes,
+        args.seed,
+    )
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+        regressions = find_regressions(results, baseline, args.threshold, args.noise_floor, args.memory_noise_floor)
+
+        for regression in regressions:
+            print(f'Regression: {regression}', file=sys.stderr)
+
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,141 @@
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from abstract_advent_day import clear_stages
+from benchmark import time_call
+from days import discover_days, load_day
+from generators import GENERATORS, write_input
+from util import clear_memos
+
+STAGES = ('read', 'puzzle_1', 'puzzle_2')
+
+# Generator size of the smallest run per day, chosen to take at least a few milliseconds
+BASE_SIZES = {
+    1: 5000, 2: 2000, 3: 2000, 4: 40, 5: 100, 6: 30, 7: 200, 8: 30, 9: 1001, 10: 100, 11: 50, 12: 30, 13: 500,
+    14: 250, 15: 10, 16: 10, 17: 4, 18: 600, 19: 20, 20: 12, 21: 50, 22: 50, 23: 40, 24: 8, 25: 100,
+}
+
+COMPLEXITY_CLASSES = [(0.5, 'O(1)'), (1.3, 'O(n)'), (1.7, 'O(n^1.5)'), (2.5, 'O(n^2)'), (math.inf, 'O(n^3)')]
+
+
+def complexity_class(exponent: float) -> str:
+    return next(name for bound, name in COMPLEXITY_CLASSES if exponent < bound)
+
+
+def fit_exponent(sizes: list[int], seconds: list[float]) -> float:
+    slope, _ = np.polyfit(np.log(sizes), np.log(seconds), 1)
+    return float(slope)
+
+
+def measure_day(day_number: int, sizes: list[int], repeat: int, directory: str) -> dict[str, dict]:
+    day = load_day(day_number)
+    stages = [stage for stage in STAGES if stage == 'read' or not getattr(day, stage).disable]
+    measurements = {stage: {'bytes': [], 'seconds': []} for stage in stages}
+    errors = {}
+
+    for size in sizes:
+        file_path = write_input(day_number, size, directory)
+        data = day.read(file_path)
+        input_bytes = os.path.getsize(file_path)
+
+        for stage in stages:
+            if stage in errors:
+                continue
+
+            # Stages and memos are cleared before every run, otherwise repeats would time cache hits.
+            # Process scoped memos are cleared too, they would carry results over from the smaller sizes.
+            func = (lambda: day.read(file_path)) if stage == 'read' else (
+                lambda: (clear_stages(data), clear_memos(), getattr(day, stage)(data))
+            )
+
+            try:
+                seconds = min(time_call(func, repeat, warmup=0))
+            except Exception as e:
+                errors[stage] = f'{type(e).__name__}: {e} (size {size})'
+                continue
+
+            measurements[stage]['bytes'].append(input_bytes)
+            measurements[stage]['seconds'].append(seconds)
+
+    results = {}
+    for stage, measured in measurements.items():
+        if stage in errors:
+            results[stage] = {**measured, 'error': errors[stage]}
+            continue
+
+        # Input size in bytes is the n, so grids and line based inputs are comparable
+        exponent = fit_exponent(measured['bytes'], measured['seconds'])
+        expected = None if stage == 'read' else getattr(getattr(day, stage), 'expected_exponent', None)
+
+        results[stage] = {
+            **measured,
+            'exponent': exponent,
+            'class': complexity_class(exponent),
+            'expected_exponent': expected,
+            'expected_class': None if expected is None else complexity_class(expected),
+        }
+
+    return results
+
+
+def find_violations(results: dict[str, dict], tolerance: float) -> list[str]:
+    return [
+        f'{day_key} {stage}: slope {measured['exponent']:.2f} exceeds {measured['expected_exponent']}'
+        for day_key, day_results in results.items()
+        for stage, measured in day_results.items()
+        if measured.get('expected_exponent') is not None
+        and measured['exponent'] > measured['expected_exponent'] + tolerance
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m complexity', description='Fit the scaling exponent per puzzle')
+    parser.add_argument('--days', type=int, nargs='*', help='days to run, all by default')
+    parser.add_argument('--steps', type=int, default=4, help='number of doublings of the base size')
+    parser.add_argument('--scale', type=float, default=1, help='multiply the base sizes')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--tolerance', type=float, default=0.3, help='allowed slope above the declared exponent')
+    parser.add_argument('--strict', action='store_true', help='exit non-zero when a slope exceeds its bound')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for day_number in args.days or discover_days():
+            if day_number not in GENERATORS:
+                continue
+
+            base = max(1, round(BASE_SIZES.get(day_number, 100) * args.scale))
+            sizes = [base * 2 ** step for step in range(args.steps)]
+            results[f'day{day_number}'] = measure_day(day_number, sizes, args.repeat, directory)
+
+            for stage, measured in results[f'day{day_number}'].items():
+                if 'error' in measured:
+                    print(f'day{day_number:<3} {stage:<9} failed: {measured['error']}')
+                    continue
+
+                expected = '' if measured['expected_exponent'] is None else (
+                    f'  expected {measured['expected_class']:<9} ({measured['expected_exponent']:.2f})'
+                )
+                print(f'day{day_number:<3} {stage:<9} {measured['class']:<9} ({measured['exponent']:.2f}){expected}')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    violations = find_violations(results, args.tolerance)
+
+    for violation in violations:
+        print(f'Too slow: {violation}', file=sys.stderr)
+
+    return 1 if args.strict and violations else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,15 @@
-import numpy as np
+from __future__ import annotations
+
+import mmap
+import os
+from typing import Iterator
+
+from lazy_import import lazy_import
+
+np = lazy_import('numpy')
+
+# 19 digit numbers can already exceed the int64 range
+MAX_INT_DIGITS = 18
 
 
 def read_full(file_path: str) -> str:
@@ -11,11 +22,53 @@ def read_lines(file_path: str) -> list[str]:
         return [line.rstrip() for line in f.readlines()]
 
 
-def read_int_matrix(file_path: str, sep: str = ' ') -> np.ndarray:
-    return np.array([*map(
-        lambda line: [*map(int, line.split(sep) if sep else list(line))],
-        read_lines(file_path),
-    )])
+def iter_lines(file_path: str) -> Iterator[str]:
+    with open(file_path, 'r') as f:
+        for line in f:
+            yield line.rstrip()
+
+
+def iter_blocks(file_path: str) -> Iterator[str]:
+    # Blank line separated blocks, holding only one block in memory
+    block = []
+
+    for line in iter_lines(file_path):
+        if line:
+            block.append(line)
+        elif block:
+            yield '\n'.join(block)
+            block = []
+
+    if block:
+        yield '\n'.join(block)
+
+
+def iter_chunks(file_path: str, size: int = 1 << 20) -> Iterator[str]:
+    with open(file_path, 'r') as f:
+        while chunk := f.read(size):
+            yield chunk
+
+
+def iter_line_chunks(file_path: str, size: int = 1 << 20) -> Iterator[np.ndarray]:
+    # Raw chunks of roughly the given size, always cut after a newline so no line is split
+    with open(file_path, 'rb') as f:
+        rest = b''
+
+        while chunk := f.read(size):
+            chunk = rest + chunk
+            end = chunk.rfind(b'\n') + 1
+            rest = chunk[end:]
+
+            if end:
+                yield np.frombuffer(chunk[:end], dtype=np.uint8)
+
+        if rest:
+            yield np.frombuffer(rest, dtype=np.uint8)
+
+
+def read_int_matrix(file_path: str) -> np.ndarray:
+    # Any non-digit separates numbers, use read_digit_grid for rows of single digits
+    return read_int_columns(file_path)
 
 
 def read_str_matrix(file_path: str) -> np.ndarray:
@@ -30,11 +83,134 @@ def str_to_str_matrix(s: str) -> np.ndarray:
         s.split('\n'),
     )])
 
+
+def read_bytes(file_path: str) -> np.ndarray:
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return np.zeros(0, dtype=np.uint8)
+
+        # The mapping stays valid after the file is closed, the returned array keeps it alive
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    return np.frombuffer(buffer, dtype=np.uint8)
+
+
+def read_byte_grid(file_path: str) -> np.ndarray:
+    return byte_grid(read_bytes(file_path))
+
+
+def read_digit_grid(file_path: str) -> np.ndarray:
+    return (read_byte_grid(file_path) - ord('0')).astype(np.int8)
+
+
+def str_to_byte_grid(s: str) -> np.ndarray:
+    return byte_grid(np.frombuffer(s.encode(), dtype=np.uint8))
+
+
+def byte_grid(raw: np.ndarray) -> np.ndarray:
+    # Trailing newlines are ignored, so the last row ends exactly at the end of the buffer
+    end = raw.size
+    while end > 0 and raw[end - 1] in (ord('\n'), ord('\r')):
+        end -= 1
+
+    if end == 0:
+        return np.zeros((0, 0), dtype=np.uint8)
+
+    raw = raw[:end]
+    width = find_byte(raw, ord('\n'))
+    stride = width + 1
+
+    if width > 0 and raw[width - 1] == ord('\r'):
+        width -= 1
+
+    # Rows are read in place with the line ending as part of the row stride
+    line_ending = stride - width
+    rows = (raw.size + line_ending) // stride
+
+    # Every row must have the same width, otherwise the strided view would misalign or run past the buffer
+    if (
+            rows * stride - line_ending != raw.size
+            or np.count_nonzero(raw == ord('\n')) != rows - 1
+            or np.any(raw[stride - 1::stride] != ord('\n'))
+    ):
+        raise ValueError(f'Rows of a byte grid must all be {width} wide')
+
+    return np.lib.stride_tricks.as_strided(raw, shape=(rows, width), strides=(stride, 1), writeable=False)
+
+
+def find_byte(raw: np.ndarray, value: int) -> int:
+    # Scans growing windows, so finding the end of the first line doesn't touch the whole file
+    start, window = 0, 4096
+
+    while start < raw.size:
+        hits = np.flatnonzero(raw[start:start + window] == value)
+
+        if hits.size:
+            return start + int(hits[0])
+
+        start += window
+        window *= 2
+
+    return raw.size
+
+
+def parse_ints(raw: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Returns every integer in the buffer together with the index of the line it is on
+    is_digit = (raw >= ord('0')) & (raw <= ord('9'))
+    edges = np.flatnonzero(np.diff(is_digit, prepend=False, append=False))
+    starts, ends = edges[::2], edges[1::2]
+
+    # Each digit is weighted by its place in the number, then the digits of a number are summed
+    lengths = ends - starts
+
+    if lengths.max(initial=0) > MAX_INT_DIGITS:
+        raise ValueError(f'Integers of more than {MAX_INT_DIGITS} digits don\'t fit in int64')
+
+    places = np.repeat(ends, lengths) - np.flatnonzero(is_digit) - 1
+    weighted = (raw[is_digit] - ord('0')).astype(np.int64) * np.power(10, places, dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(lengths[:-1])))
+    values = np.add.reduceat(weighted, offsets) if starts.size else np.zeros(0, dtype=np.int64)
+
+    negative = (starts > 0) & (raw[np.maximum(starts - 1, 0)] == ord('-'))
+    values[negative] *= -1
+
+    lines = np.searchsorted(np.flatnonzero(raw == ord('\n')), starts)
+
+    return values, lines
+
+
+def read_int_columns(file_path: str) -> np.ndarray:
+    values, lines = parse_ints(read_bytes(file_path))
+
+    # Lines without numbers, like a trailing blank line, are not rows
+    lengths = np.bincount(lines)
+    lengths = lengths[lengths > 0]
+
+    if np.any(lengths != lengths[:1]):
+        raise ValueError('Every line needs the same number of integers')
+
+    return values.reshape(lengths.size, lengths[0] if lengths.size else 0)
+
+
+def read_ragged_ints(file_path: str, fill: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    return ragged_ints(read_bytes(file_path), fill)
+
+
+def ragged_ints(raw: np.ndarray, fill: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    values, lines = parse_ints(raw)
+
+    # Rows are padded with the fill value up to the longest row, blank lines after the last number are no rows
+    lengths = np.bincount(lines)
+    row_starts = np.cumsum(lengths) - lengths
+    padded = np.full((lengths.size, lengths.max(initial=0)), fill, dtype=np.int64)
+    padded[lines, np.arange(values.size) - row_starts[lines]] = values
+
+    return padded, lengths
+
+
 def int_array(s: str) -> np.ndarray:
-    return np.array(
-        [*map(int, s.split(' '))],
-        dtype=np.int64,
-    )
+    values, _ = parse_ints(np.frombuffer(s.encode(), dtype=np.uint8))
+    return values
 
 
 def split_once(s: str, sep: str) -> tuple[str, str]:
@@ -0,0 +1,32 @@
+import importlib
+import os
+import re
+
+from abstract_advent_day import AbstractAdventDay
+
+DAYS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def discover_days() -> list[int]:
+    return sorted(
+        int(match.group(1))
+        for name in os.listdir(DAYS_DIR)
+        if (match := re.fullmatch(r'day(\d+)', name)) and int(match.group(1)) > 0
+    )
+
+
+def load_day(day: int) -> AbstractAdventDay:
+    module = importlib.import_module(f'days.day{day}')
+    return module.AdventDay('solve_puzzles')
+
+
+def input_path(day: int, example: bool = False) -> str | None:
+    candidates = ['input_example.txt', 'input_example_1.txt'] if example else ['input.txt']
+
+    for candidate in candidates:
+        path = os.path.join(DAYS_DIR, f'day{day}', candidate)
+
+        if os.path.isfile(path):
+            return path
+
+    return None
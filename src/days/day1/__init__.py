@@ -1,8 +1,14 @@
+import os
+import tempfile
 from dataclasses import dataclass
 from abstract_advent_day import *
 from data_reader import *
 from util import *
 
+# Parsing needs many times the chunk size in temporaries, so chunks stay small
+CHUNK_SIZE = 1 << 22
+BLOCK_SIZE = 1 << 16
+
 
 @dataclass(slots=True, frozen=True)
 class Data:
@@ -13,28 +19,103 @@ class Data:
 @advent_info(day=1)
 class AdventDay(AbstractAdventDay):
     def read(self, file_path: str) -> Data:
-        lines = read_lines(file_path)
-
-        columns = np.array([*map(
-            lambda line: [*map(int, split_once(line, '   '))],
-            lines,
-        )]).T
+        columns = read_int_columns(file_path).T
 
         return Data(
             list1=columns[0],
             list2=columns[1],
         )
 
+    @expected_complexity(1)
     @expected_answers(example_answer=11, answer=2264607)
     def puzzle_1(self, data: Data) -> int:
         return np.abs(np.sort(data.list1) - np.sort(data.list2)).sum()
 
+    @expected_complexity(1)
     @expected_answers(example_answer=31, answer=19457120)
     def puzzle_2(self, data: Data) -> int:
-        list1_freq = dict(zip(*np.unique_counts(data.list1)))
-        list2_freq = dict(zip(*np.unique_counts(data.list2)))
+        return similarity_score(np.sort(data.list1), np.sort(data.list2))
+
+    def solve_stream(self, file_path: str, chunk_size: int = CHUNK_SIZE, block_size: int = BLOCK_SIZE) -> tuple[int, int]:
+        # Both lists are sorted out of core: sorted runs per chunk, then merged into one memory-mapped file per list
+        with tempfile.TemporaryDirectory() as directory:
+            run_paths, bounds = write_sorted_runs(file_path, directory, chunk_size)
+
+            if bounds[-1] == 0:
+                return 0, 0
+
+            list1, list2 = (
+                merge_runs(run_path, bounds, os.path.join(directory, f'list{column}'), block_size)
+                for column, run_path in enumerate(run_paths, start=1)
+            )
+
+            return total_distance(list1, list2, block_size), similarity_score(list1, list2, block_size)
+
+
+def write_sorted_runs(file_path: str, directory: str, chunk_size: int) -> tuple[list[str], list[int]]:
+    run_paths = [os.path.join(directory, f'runs{column}') for column in (1, 2)]
+    bounds = [0]
+
+    with open(run_paths[0], 'wb') as runs1, open(run_paths[1], 'wb') as runs2:
+        for chunk in iter_line_chunks(file_path, chunk_size):
+            values, _ = parse_ints(chunk)
+            pairs = values.reshape(-1, 2)
+
+            np.sort(pairs[:, 0]).tofile(runs1)
+            np.sort(pairs[:, 1]).tofile(runs2)
+            bounds.append(bounds[-1] + len(pairs))
+
+    return run_paths, bounds
+
+
+def merge_runs(run_path: str, bounds: list[int], merged_path: str, block_size: int) -> np.ndarray:
+    runs = np.memmap(run_path, dtype=np.int64, mode='r')
+    merged = np.memmap(merged_path, dtype=np.int64, mode='w+', shape=(bounds[-1],))
+    cursors, ends = bounds[:-1], bounds[1:]
+    pos = 0
+
+    # k-way merge a block per run at a time, holding at most one block of every run in memory
+    while active := [run for run in range(len(cursors)) if cursors[run] < ends[run]]:
+        heads = {run: runs[cursors[run]:min(cursors[run] + block_size, ends[run])] for run in active}
+
+        # No run can still hold a value below the smallest block end, so everything up to it is final
+        threshold = min(head[-1] for head in heads.values())
+        parts = []
+
+        for run, head in heads.items():
+            taken = int(np.searchsorted(head, threshold, side='right'))
+            parts.append(head[:taken])
+            cursors[run] += taken
+
+        block = np.sort(np.concatenate(parts))
+        merged[pos:pos + block.size] = block
+        pos += block.size
+
+    merged.flush()
+
+    return merged
+
+
+def total_distance(list1: np.ndarray, list2: np.ndarray, block_size: int = BLOCK_SIZE) -> int:
+    return sum(
+        int(np.abs(list1[start:start + block_size] - list2[start:start + block_size]).sum())
+        for start in range(0, len(list1), block_size)
+    )
+
+
+def similarity_score(list1: np.ndarray, list2: np.ndarray, block_size: int = BLOCK_SIZE) -> int:
+    # Merge-join of both sorted lists, list2 is only searched from the cursor onwards
+    score, cursor = 0, 0
+
+    for start in range(0, len(list1), block_size):
+        values = np.asarray(list1[start:start + block_size])
+        rest = list2[cursor:]
+        first = np.searchsorted(rest, values, side='left')
+        counts = np.searchsorted(rest, values, side='right') - first
+
+        score += int((values * counts).sum())
+
+        # The next block can repeat the largest value, so the cursor stops before it
+        cursor += int(first[-1])
 
-        return sum([
-            possible_id * list1_freq[possible_id] * list2_freq[possible_id]
-            for possible_id in np.intersect1d(data.list1, data.list2)
-        ])
+    return score
@@ -5,90 +5,73 @@ from data_reader import *
 from util import *
 
 
+TRAILHEAD, PEAK = b'09'
+
+
 @dataclass(slots=True, frozen=True)
 class Data:
-    trail_map: np.ndarray
+    trail_map: Grid
 
 
 @advent_info(day=10)
 class AdventDay(AbstractAdventDay):
     def read(self, file_path: str) -> Data:
-        return Data(read_int_matrix(file_path, sep=''))
+        # Heights are kept as digit characters, the zero sentinel is never one step up
+        return Data(Grid(read_byte_grid(file_path)))
 
+    @expected_complexity(1)
     @expected_answers(example_answer=36, answer=841)
     def puzzle_1(self, data: Data) -> int:
-        trailheads = np.argwhere(data.trail_map == 0)
-
-        score = 0
-
-        for (row, col) in trailheads:
-            queue = deque([(row, col)])
-            visited = set()
-            reachable_peaks = set()
-
-            while queue:
-                row, col = queue.popleft()
-
-                if (row, col) in visited:
-                    continue
-                else:
-                    visited.add((row, col))
-
-                current_height = data.trail_map[row, col]
+        # The visited set is cleared after each trailhead, only resetting the positions it reached
+        visited = CoordSet(data.trail_map.size)
+        return sum(count_reachable_peaks(data.trail_map, trailhead, visited) for trailhead in data.trail_map.find_all(TRAILHEAD).tolist())
 
-                if current_height == 9:
-                    reachable_peaks.add((row, col))
-                    continue
-
-                for (r, c) in [(row + 1, col), (row - 1, col), (row, col + 1), (row, col - 1)]:
-                    if (
-                            (r, c) not in visited and
-                            in_2d_grid(data.trail_map, r, c) and
-                            data.trail_map[r, c] - current_height == 1
-                    ):
-                        queue.append((r, c))
-
-            score += len(reachable_peaks)
+    @expected_complexity(1)
+    @expected_answers(example_answer=81, answer=1875)
+    def puzzle_2(self, data: Data) -> int:
+        return count_trails(data.trail_map)
 
-        return score
 
+def count_reachable_peaks(trail_map: Grid, trailhead: int, visited: CoordSet) -> int:
+    cells, offsets = trail_map.cells, trail_map.offsets
+    queue = deque([trailhead])
+    reached = [trailhead]
+    visited.add(trailhead)
+    peaks = 0
 
-    @expected_answers(example_answer=81, answer=1875)
-    def puzzle_2(self, data: Data) -> int:
-        trailheads = np.argwhere(data.trail_map == 0)
+    while queue:
+        pos = queue.popleft()
+        height = cells[pos]
 
-        score = 0
+        if height == PEAK:
+            peaks += 1
+            continue
 
-        for (row, col) in trailheads:
-            queue = deque([(row, col, set())])
-            reachable_peaks = dict()
+        for offset in offsets:
+            if cells[pos + offset] == height + 1 and pos + offset not in visited:
+                visited.add(pos + offset)
+                reached.append(pos + offset)
+                queue.append(pos + offset)
 
-            while queue:
-                row, col, visited = queue.popleft()
+    visited.clear(reached)
 
-                if (row, col) in visited:
-                    continue
-                else:
-                    visited.add((row, col))
+    return peaks
 
-                current_height = data.trail_map[row, col]
 
-                if current_height == 9:
-                    if (row, col) in reachable_peaks:
-                        reachable_peaks[(row, col)] += 1
-                    else:
-                        reachable_peaks[(row, col)] = 1
+def count_trails(trail_map: Grid) -> int:
+    # Trails from each position, summed over the neighbours one step up, going down from the peaks.
+    # Every position is visited once, however many trails pass through it.
+    heights = trail_map.array
+    trails = (heights == PEAK).astype(np.int64)
 
-                    continue
+    for height in range(PEAK - 1, TRAILHEAD - 1, -1):
+        positions = np.flatnonzero(heights == height)
+        counts = np.zeros(len(positions), dtype=np.int64)
 
-                for (r, c) in [(row + 1, col), (row - 1, col), (row, col + 1), (row, col - 1)]:
-                    if (
-                            (r, c) not in visited and
-                            in_2d_grid(data.trail_map, r, c) and
-                            data.trail_map[r, c] - current_height == 1
-                    ):
-                        queue.append((r, c, visited.copy()))
+        for offset in trail_map.offsets:
+            neighbours = positions + offset
+            counts += np.where(heights[neighbours] == height + 1, trails[neighbours], 0)
 
-            score += sum(reachable_peaks.values())
+        trails[positions] = counts
 
-        return score
+    return int(trails[heights == TRAILHEAD].sum())
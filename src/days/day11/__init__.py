@@ -1,6 +1,5 @@
 from collections import defaultdict
 from dataclasses import dataclass
-from functools import lru_cache
 
 from abstract_advent_day import *
 from data_reader import *
@@ -47,7 +46,7 @@ def perform_blinks(initial_stones: list[int], blinks: int) -> dict[int, int]:
     return stone_counts
 
 
-@lru_cache(maxsize=None)
+@memo(max_size=1 << 16)
 def transform_stone(stone_id: int) -> tuple[int, int | None]:
     if stone_id == 0:
         return 1, None
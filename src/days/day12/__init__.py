@@ -1,100 +1,73 @@
-import operator
-from collections import deque
 from dataclasses import dataclass
-from itertools import pairwise
 
 from abstract_advent_day import *
 from data_reader import *
 from util import *
 
 
-@dataclass(slots=True, frozen=True)
+@dataclass(slots=True, frozen=True, weakref_slot=True)
 class Data:
-    garden: np.ndarray
-
-type Coord = tuple[int, int]
-type Edge = tuple[str, *Coord]
-type Region = tuple[set[Coord], set[Edge]]
+    garden: Grid
 
 @advent_info(day=12)
 class AdventDay(AbstractAdventDay):
     def read(self, file_path: str) -> Data:
-        return Data(read_str_matrix(file_path))
+        return Data(Grid(read_byte_grid(file_path)))
 
+    @expected_complexity(1)
     @expected_answers(example_answer=1930, answer=1465968)
     def puzzle_1(self, data: Data) -> int:
-        regions = cluster_regions(data.garden)
-        return sum(len(coords) * len(edges) for coords, edges in regions)
+        return fence_price(region_labels(data), count_edges(data.garden.view()))
 
+    @expected_complexity(1)
     @expected_answers(example_answer=(80, 436, 236, 368, 1206), answer=897702)
     def puzzle_2(self, data: Data) -> int:
-        regions = cluster_regions(data.garden)
-        return sum(len(coords) * count_sides(edges) for coords, edges in regions)
-
-def cluster_regions(garden: np.ndarray) -> list[Region]:
-    regions = []
-
-    queue = deque([(0, 0)])
-    visited = set()
-
-    # BFS per region
-    while queue:
-        start = queue.popleft()
-
-        if start in visited:
-            continue
-
-        region_label = garden[start]
-        region_coords = set()
-        region_edges = set()
-        region_queue = deque([start])
+        # A region has as many sides as corners
+        return fence_price(region_labels(data), count_corners(data.garden.view()))
 
-        while region_queue:
-            (y, x) = region_queue.popleft()
+def fence_price(labels: np.ndarray, fences: np.ndarray) -> int:
+    areas = np.bincount(labels.ravel())
+    region_fences = np.bincount(labels.ravel(), weights=fences.ravel(), minlength=areas.size).astype(np.int64)
 
-            if (y, x) in visited:
-                continue
+    return int(areas @ region_fences)
 
-            visited.add((y, x))
-            region_coords.add((y, x))
+@stage
+def region_labels(data: Data) -> np.ndarray:
+    # Every plot is labelled with the root of its region
+    plots = data.garden.view()
+    regions = cluster_regions(plots)
 
-            for direction, dy, dx in [('S', 1, 0), ('E', 0, 1), ('N', -1, 0), ('W', 0, -1)]:
-                (ny, nx) = (y + dy, x + dx)
+    return regions.labels().reshape(plots.shape)
 
-                if not in_2d_grid(garden, ny, nx):
-                    region_edges.add((direction, y, x))
-                    continue
+def cluster_regions(plots: np.ndarray) -> UnionFind:
+    # Plots are numbered row by row, neighbouring plots with the same plant are joined
+    ids = np.arange(plots.size).reshape(plots.shape)
+    regions = UnionFind(plots.size)
 
-                if garden[ny, nx] == region_label:
-                    region_queue.append((ny, nx))
-                else:
-                    region_edges.add((direction, y, x))
-                    queue.append((ny, nx))
+    same_east = plots[:, :-1] == plots[:, 1:]
+    regions.union_many(ids[:, :-1][same_east], ids[:, 1:][same_east])
 
-        regions.append((region_coords, region_edges))
+    same_south = plots[:-1] == plots[1:]
+    regions.union_many(ids[:-1][same_south], ids[1:][same_south])
 
     return regions
 
-def count_sides(edges: set[tuple[str, int, int]]) -> int:
-    sides = 0
-
-    for direction in ['N', 'E', 'S', 'W']:
-        edges_in_direction = [*filter(lambda edge: edge[0] == direction, edges)]
-
-        if len(edges_in_direction) == 0:
-            continue
-
-        if direction in ['N', 'S']:
-            edges_in_direction.sort(key=operator.itemgetter(1, 2))  # Sort by row, col
-            dy, dx = 0, 1  # Expected diff between edges
-        else:
-            edges_in_direction.sort(key=operator.itemgetter(2, 1))  # Sort by col, row
-            dy, dx = 1, 0  # Expected diff between edges
-
-        # Count non-consecutive edges in same direction
-        sides += 1
-        for (_, r1, c1), (_, r2, c2) in pairwise(edges_in_direction):
-            if r2 - r1 != dy or c2 - c1 != dx:
-                sides += 1
-
-    return sides
+def count_edges(plots: np.ndarray) -> np.ndarray:
+    moore = moore_stencil(plots)
+    return sum((neighbour != plots).astype(np.int64) for neighbour in [moore.N, moore.E, moore.S, moore.W])
+
+def count_corners(plots: np.ndarray) -> np.ndarray:
+    moore = moore_stencil(plots)
+    corners = np.zeros(plots.shape, dtype=np.int64)
+
+    for side_a, side_b, diagonal in [
+        (moore.N, moore.E, moore.NE),
+        (moore.E, moore.S, moore.SE),
+        (moore.S, moore.W, moore.SW),
+        (moore.W, moore.N, moore.NW),
+    ]:
+        outer = (side_a != plots) & (side_b != plots)
+        inner = (side_a == plots) & (side_b == plots) & (diagonal != plots)
+        corners += outer | inner
+
+    return corners
@@ -18,18 +18,14 @@ class Machine:
 class Data:
     machines: list[Machine]
 
+MACHINE_REGEX = re.compile(r"Button A: X\+(?P<ax>\d+), Y\+(?P<ay>\d+)\nButton B: X\+(?P<bx>\d+), Y\+(?P<by>\d+)\nPrize: X=(?P<x>\d+), Y=(?P<y>\d+)", re.MULTILINE)
+
 @advent_info(day=13)
 class AdventDay(AbstractAdventDay):
     def read(self, file_path: str) -> Data:
-        regex = re.compile(r"Button A: X\+(?P<ax>\d+), Y\+(?P<ay>\d+)\nButton B: X\+(?P<bx>\d+), Y\+(?P<by>\d+)\nPrize: X=(?P<x>\d+), Y=(?P<y>\d+)", re.MULTILINE)
-
-        machines = []
-        for section in read_full(file_path).split('\n\n'):
-            ax, ay, bx, by, x, y = regex.search(section).groups()
-            machines.append(Machine(int(ax), int(ay), int(bx), int(by), int(x), int(y)))
-
-        return Data(machines)
+        return Data([*map(parse_machine, read_full(file_path).split('\n\n'))])
 
+    @expected_complexity(1)
     @expected_answers(example_answer=480, answer=36870)
     def puzzle_1(self, data: Data) -> int:
         return sum(
@@ -37,6 +33,7 @@ class AdventDay(AbstractAdventDay):
             for m in data.machines
         )
 
+    @expected_complexity(1)
     @expected_answers(example_answer=875318608908, answer=78101482023732)
     def puzzle_2(self, data: Data) -> int:
         return sum(
@@ -44,6 +41,20 @@ class AdventDay(AbstractAdventDay):
             for m in data.machines
         )
 
+    def solve_stream(self, file_path: str) -> tuple[int, int]:
+        tokens, tokens_corrected = 0, 0
+
+        for section in iter_blocks(file_path):
+            m = parse_machine(section)
+            tokens += count_tokens(*find_intersection(m.ax, m.ay, m.bx, m.by, m.x, m.y))
+            tokens_corrected += count_tokens(*find_intersection(m.ax, m.ay, m.bx, m.by, m.x + 10000000000000, m.y + 10000000000000))
+
+        return tokens, tokens_corrected
+
+def parse_machine(section: str) -> Machine:
+    ax, ay, bx, by, x, y = MACHINE_REGEX.search(section).groups()
+    return Machine(int(ax), int(ay), int(bx), int(by), int(x), int(y))
+
 def find_intersection(ax: int, ay: int, bx: int, by: int, x: int, y: int) -> tuple[int, int]:
     # Cramer's rule
     divisor = det(np.array([
@@ -8,7 +8,7 @@ from util import *
 import re
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class Robot:
     position: tuple[int, int]
     velocity: tuple[int, int]
@@ -76,15 +76,13 @@ class AdventDay(AbstractAdventDay):
     @expected_answers(example_answer=1, answer=6532)
     def puzzle_2(self, data: Data) -> int:
         steps = 0
+        positions = [robot.position for robot in data.robots]
 
-        while len(set(robot.position for robot in data.robots)) != len(data.robots):
-            for robot in data.robots:
-                (y, x), (dy, dx) = robot.position, robot.velocity
-
-                robot.position = (
-                    (y + dy) % data.height,
-                    (x + dx) % data.width,
-                )
+        while len(set(positions)) != len(positions):
+            positions = [
+                ((y + dy) % data.height, (x + dx) % data.width)
+                for (y, x), (dy, dx) in zip(positions, (robot.velocity for robot in data.robots))
+            ]
 
             steps += 1
 
@@ -1,4 +1,3 @@
-from collections import deque
 from dataclasses import dataclass
 
 import numpy as np
@@ -7,125 +6,129 @@ from abstract_advent_day import *
 from data_reader import *
 from util import *
 
+WALL, BOX, EMPTY, ROBOT, BOX_L, BOX_R = b'#O.@[]'
+
 
 @dataclass(slots=True, frozen=True)
 class Data:
     grid: np.ndarray
-    moves: list[np.ndarray]
+    moves: list[Direction]
+
+MOVES = {
+    '^': Direction.N,
+    'v': Direction.S,
+    '<': Direction.W,
+    '>': Direction.E,
+}
 
-Moves = {
-    '^': np.array([-1, 0]),
-    'v': np.array([1, 0]),
-    '<': np.array([0, -1]),
-    '>': np.array([0, 1]),
+# Every tile is twice as wide in the second warehouse
+WIDE_TILES = {
+    WALL: b'##',
+    BOX: b'[]',
+    EMPTY: b'..',
+    ROBOT: b'@.',
 }
 
 @advent_info(day=15)
 class AdventDay(AbstractAdventDay):
     def read(self, file_path: str) -> Data:
         grid_s, moves_s = split_once(read_full(file_path), '\n\n')
-        moves = [Moves[move] for move in moves_s if move != "\n"]
+        moves = [MOVES[move] for move in moves_s if move != "\n"]
 
         return Data(
-            grid=str_to_str_matrix(grid_s),
+            grid=str_to_byte_grid(grid_s),
             moves=moves,
         )
 
+    @expected_complexity(1)
     @expected_answers(example_answer=(2028, 10092), answer=1413675)
     def puzzle_1(self, data: Data) -> int:
-        robot_pos = np.argwhere(data.grid == '@')[0]
-        boxes = [*map(tuple, np.argwhere(data.grid == 'O'))]
-
-        for dydx in data.moves:
-            lookahead = robot_pos + dydx
-
-            boxes_to_move = set()
-            while True:
-                try:
-                    box_index = boxes.index(tuple(lookahead))
-                    boxes_to_move.add(box_index)
-                    lookahead += dydx
-                except ValueError:
-                    break
-
-            if not in_2d_grid(data.grid, *lookahead) or data.grid[*lookahead] == '#':
-                continue
+        grid = Grid(data.grid, sentinel=WALL)
+        cells = grid.cells
+        robot = grid.find(ROBOT)
+        cells[robot] = EMPTY
 
-            for box_index in boxes_to_move:
-                (y, x) = boxes[box_index]
-                boxes[box_index] = (y + dydx[0], x + dydx[1])
+        for direction in data.moves:
+            offset = grid.offsets[direction]
+            lookahead = robot + offset
 
-            robot_pos += dydx
+            while cells[lookahead] == BOX:
+                lookahead += offset
 
-        return sum(y * 100 + x for y, x in boxes)
+            if cells[lookahead] == WALL:
+                continue
+
+            # Moving a row of boxes is the same as moving its first box to the end
+            robot += offset
+            cells[lookahead] = cells[robot]
+            cells[robot] = EMPTY
 
+        return gps_sum(grid, BOX)
 
+    @expected_complexity(1)
     @expected_answers(example_answer=9021, answer=1399772)
     def puzzle_2(self, data: Data) -> int:
-        grid = np.zeros((data.grid.shape[0], data.grid.shape[1] * 2), dtype=str)
-        grid.fill('.')
-
-        for r in range(data.grid.shape[0]):
-            for c in range(data.grid.shape[1]):
-                v = data.grid[r, c]
-
-                if v == '#':
-                    grid[r, c * 2] = '#'
-                    grid[r, c * 2 + 1] = '#'
-                elif v == 'O':
-                    grid[r, c * 2] = '['
-                    grid[r, c * 2 + 1] = ']'
-                elif v == '@':
-                    grid[r, c * 2] = '@'
-
-        robot_pos = np.argwhere(grid == '@')[0]
-        boxes_l = [*map(tuple, np.argwhere(grid == '['))]
-        boxes_r = [*map(tuple, np.argwhere(grid == ']'))]
-
-        for dydx in data.moves:
-            boxes_to_move, has_obstruction = find_boxes_to_move(robot_pos, dydx, grid, boxes_l, boxes_r)
-
-            if has_obstruction:
+        wide_tiles = np.zeros((256, 2), dtype=np.uint8)
+        for tile, wide_tile in WIDE_TILES.items():
+            wide_tiles[tile] = [*wide_tile]
+
+        grid = Grid(wide_tiles[data.grid].reshape(data.grid.shape[0], -1), sentinel=WALL)
+        cells = grid.cells
+        robot = grid.find(ROBOT)
+        cells[robot] = EMPTY
+
+        for direction in data.moves:
+            offset = grid.offsets[direction]
+            boxes_to_move = find_boxes_to_move(grid, robot + offset, offset)
+
+            if boxes_to_move is None:
                 continue
 
-            for box_index in boxes_to_move:
-                (ly, lx) = boxes_l[box_index]
-                (ry, rx) = boxes_r[box_index]
-                boxes_l[box_index] = (ly + dydx[0], lx + dydx[1])
-                boxes_r[box_index] = (ry + dydx[0], rx + dydx[1])
+            for box in boxes_to_move:
+                cells[box] = cells[box + 1] = EMPTY
 
-            robot_pos += dydx
+            for box in boxes_to_move:
+                cells[box + offset] = BOX_L
+                cells[box + offset + 1] = BOX_R
 
-        return sum(y * 100 + x for y, x in boxes_l)
+            robot += offset
 
-def find_boxes_to_move(
-        robot_pos: np.ndarray,
-        dydx: np.ndarray,
-        grid: np.ndarray,
-        boxes_l: list[tuple[int, int]],
-        boxes_r: list[tuple[int, int]],
-) -> tuple[set[int], bool]:
-    queue = deque([robot_pos + dydx])
-    boxes_to_move = set()
+        return gps_sum(grid, BOX_L)
+
+def find_boxes_to_move(grid: Grid, pos: int, offset: int) -> list[int] | None:
+    # Left halves of the pushed boxes, or None if a wall is in the way
+    cells = grid.cells
+    queue = [pos]
+    boxes_to_move = []
+    seen = set()
 
     while queue:
-        pos = queue.popleft()
+        pos = queue.pop()
 
-        if not in_2d_grid(grid, *pos) or grid[*pos] == '#':
-            return set(), True
+        if cells[pos] == WALL:
+            return None
 
-        pos_t = tuple(pos)
-        if pos_t in boxes_l or pos_t in boxes_r:
-            try:
-                index = boxes_l.index(pos_t)
-            except ValueError:
-                index = boxes_r.index(pos_t)
+        if cells[pos] == EMPTY:
+            continue
 
-            if index in boxes_to_move:
-                continue
+        box = pos if cells[pos] == BOX_L else pos - 1
+
+        if box in seen:
+            continue
+
+        seen.add(box)
+        boxes_to_move.append(box)
+
+        # Pushing sideways only the far half of the box can hit something
+        if offset == 1:
+            queue.append(box + 2)
+        elif offset == -1:
+            queue.append(box - 1)
+        else:
+            queue += [box + offset, box + 1 + offset]
 
-            boxes_to_move.add(index)
-            queue.append(np.array([*boxes_l[index]]) + dydx)
-            queue.append(np.array([*boxes_r[index]]) + dydx)
+    return boxes_to_move
 
-    return boxes_to_move, False
\ No newline at end of file
+def gps_sum(grid: Grid, box: int) -> int:
+    y, x = np.divmod(grid.find_all(box), grid.stride)
+    return int(((y - grid.padding) * 100 + x - grid.padding).sum())
@@ -1,5 +1,3 @@
-from sys import maxsize
-from collections import deque
 from dataclasses import dataclass
 
 import numpy as np
@@ -11,76 +9,60 @@ from util import *
 
 @dataclass(slots=True, frozen=True)
 class Data:
-    grid: np.ndarray
-
-STEP_IN_DIRECTION = {
-    'N': (-1, 0),
-    'E': (0, 1),
-    'S': (1, 0),
-    'W': (0, -1),
-}
-
-OPPOSITE_DIRECTION = {
-    'N': 'S',
-    'E': 'W',
-    'S': 'N',
-    'W': 'E',
-}
-
-TURN_DIRECTIONS = {
-    'N': ['E', 'W'],
-    'E': ['N', 'S'],
-    'S': ['W', 'E'],
-    'W': ['S', 'N'],
-}
+    grid: Grid
+
+WALL, START, END = b'#SE'
+
+STEP_COST, TURN_COST = 1, 1000
 
 @advent_info(day=16)
 class AdventDay(AbstractAdventDay):
     def read(self, file_path: str) -> Data:
-        return Data(read_str_matrix(file_path))
+        return Data(Grid(read_byte_grid(file_path)))
 
+    @expected_complexity(1)
     @expected_answers(example_answer=(7036, 11048), answer=99460)
     def puzzle_1(self, data: Data) -> int:
-        return [*find_paths(data.grid)][-1][0]
+        grid = data.grid
+        return min_cost_at(find_costs(grid, [grid.find(START) * 4 + Direction.E]), grid.find(END))
 
+    @expected_complexity(1)
     @expected_answers(example_answer=(45, 64), answer=500)
     def puzzle_2(self, data: Data) -> int:
-        min_cost = maxsize
-        min_visited = set()
-
-        for cost, visited in find_paths(data.grid):
-            if cost < min_cost:
-                min_cost = cost
-                min_visited = visited
-            elif cost == min_cost:
-                min_visited |= visited
-
-        return len(min_visited)
-
-def find_paths(grid: np.ndarray) -> tuple[int, set[tuple[int, int]]]:
-    start = tuple(np.argwhere(grid == 'S')[0])
-    queue = deque([(start, 'E', 0, set())])
-    min_cost_pos = dict()
-
-    while queue:
-        (y, x), direction, cost, visited = queue.popleft()
-
-        for d in [direction, *TURN_DIRECTIONS[direction]]:
-            dy, dx = STEP_IN_DIRECTION[d]
-            new_pos = (y + dy, x + dx)
-            new_cost = cost + (1 if d == direction else 1001)
-
-            if new_pos in visited:
-                continue
-
-            if grid[new_pos] == '.':
-                if d == direction:  # Only if able to continue in same direction
-                    if (y, x) in min_cost_pos and cost > min_cost_pos[(y, x)]:
-                        continue
-                    else:
-                        min_cost_pos[(y, x)] = cost
-
-                queue.append((new_pos, d, new_cost, {*visited, (y, x)}))
-
-            if grid[new_pos] == 'E':
-                yield new_cost, {*visited, (y, x), new_pos}
\ No newline at end of file
+        grid = data.grid
+        end = grid.find(END)
+        from_start = find_costs(grid, [grid.find(START) * 4 + Direction.E])
+        min_cost = min_cost_at(from_start, end)
+
+        # Walking a best path backwards is walking forwards in the opposite direction from the end
+        to_end = find_costs(grid, [
+            end * 4 + direction.opposite()
+            for direction in Direction
+            if from_start.distance[end * 4 + direction] == min_cost
+        ])
+        opposite = [direction.opposite() for direction in Direction]
+        remaining = to_end.distance.reshape(-1, 4)[:, opposite]
+
+        on_best_path = (from_start.distance.reshape(-1, 4) + remaining == min_cost) & (remaining != UNREACHED)
+
+        return int(np.count_nonzero(on_best_path.any(axis=1)))
+
+def find_costs(grid: Grid, sources: list[int]) -> SearchResult:
+    # Nodes are position * 4 + direction
+    cells, offsets = grid.cells, grid.offsets
+
+    def edges(node: int) -> list[tuple[int, int]]:
+        pos, direction = divmod(node, 4)
+        forward = pos + offsets[direction]
+
+        return [
+            (pos * 4 + (direction + 1) % 4, TURN_COST),
+            (pos * 4 + (direction + 3) % 4, TURN_COST),
+            *([(forward * 4 + direction, STEP_COST)] if cells[forward] != WALL else []),
+        ]
+
+    return bucket_dijkstra(grid.size * 4, sources, edges, max_weight=TURN_COST)
+
+def min_cost_at(result: SearchResult, position: int) -> int:
+    costs = result.distance[position * 4:position * 4 + 4]
+    return int(costs[costs != UNREACHED].min())
@@ -22,39 +22,61 @@ class AdventDay(AbstractAdventDay):
 
     @expected_answers(example_answer=6, answer=280)
     def puzzle_1(self, data: Data) -> int:
-        impossible_patterns = set()
-
-        def is_possible_pattern(pattern: str) -> bool:
-            if pattern == '':
-                return True
-
-            if pattern in impossible_patterns:
-                return False
-
-            for towel in data.towels:
-                if pattern.startswith(towel) and is_possible_pattern(pattern[len(towel):]):
-                    return True
-
-            impossible_patterns.add(pattern)
-            return False
-
-        return sum(is_possible_pattern(p) for p in data.patterns)
+        return sum(is_possible_pattern(p, data.towels) for p in data.patterns)
 
     @expected_answers(example_answer=16, answer=606411968721181)
     def puzzle_2(self, data: Data) -> int:
-        pattern_arrangement_count = dict()
-
-        def count_arrangements(pattern: str) -> int:
-            if pattern == '':
-                return 1
-
-            if pattern not in pattern_arrangement_count:
-                pattern_arrangement_count[pattern] = sum(
-                    count_arrangements(pattern[len(towel):])
-                    for towel in data.towels
-                    if pattern.startswith(towel)
-                )
-
-            return pattern_arrangement_count[pattern]
+        return sum(count_arrangements(p, data.towels) for p in data.patterns)
+
+    def solve_stream(self, file_path: str) -> tuple[int, int]:
+        lines = iter_lines(file_path)
+        towels = frozenset(next(lines).split(', '))
+        max_towel = max(map(len, towels))
+        possible, arrangements = 0, 0
+
+        for pattern in lines:
+            if not pattern:
+                continue
+
+            count = count_pattern_arrangements(pattern, towels, max_towel)
+            possible += count > 0
+            arrangements += count
+
+        return possible, arrangements
+
+# The towels are the same for every call on an input, so only the pattern is part of the key
+@memo(max_size=1 << 16, scope='input', key=lambda pattern, towels: pattern)
+def is_possible_pattern(pattern: str, towels: list[str]) -> bool:
+    # Stops at the first arrangement, counting them all is only needed for puzzle 2
+    if pattern == '':
+        return True
+
+    for towel in towels:
+        if pattern.startswith(towel) and is_possible_pattern(pattern[len(towel):], towels):
+            return True
+
+    return False
+
+@memo(max_size=1 << 16, scope='input', key=lambda pattern, towels: pattern)
+def count_arrangements(pattern: str, towels: list[str]) -> int:
+    if pattern == '':
+        return 1
+
+    return sum(
+        count_arrangements(pattern[len(towel):], towels)
+        for towel in towels
+        if pattern.startswith(towel)
+    )
+
+def count_pattern_arrangements(pattern: str, towels: frozenset[str], max_towel: int) -> int:
+    # counts[i] is the number of ways to build pattern[i:], nothing is kept between patterns
+    counts = [0] * len(pattern) + [1]
+
+    for i in range(len(pattern) - 1, -1, -1):
+        counts[i] = sum(
+            counts[i + length]
+            for length in range(1, min(max_towel, len(pattern) - i) + 1)
+            if pattern[i:i + length] in towels
+        )
 
-        return sum(count_arrangements(p) for p in data.patterns)
+    return counts[0]
@@ -6,30 +6,73 @@ from util import *
 
 @dataclass(slots=True, frozen=True)
 class Data:
-    reports: list[np.ndarray]
+    levels: np.ndarray
+    lengths: np.ndarray
 
 
 @advent_info(day=2)
 class AdventDay(AbstractAdventDay):
     def read(self, file_path: str) -> Data:
-        return Data(
-            reports=[*map(int_array, read_lines(file_path))],
-        )
+        return Data(*read_ragged_ints(file_path))
 
+    @expected_complexity(1)
     @expected_answers(example_answer=2, answer=502)
     def puzzle_1(self, data: Data) -> int:
-        return sum(is_safe_report(report) for report in data.reports)
+        return int(np.count_nonzero(safe_reports(data.levels, data.lengths)))
 
+    @expected_complexity(1)
     @expected_answers(example_answer=4, answer=544)
     def puzzle_2(self, data: Data) -> int:
-        return sum(
-            any(
-                is_safe_report(np.delete(report, removed_level))
-                for removed_level in range(len(report))
-            ) for report in data.reports
-        )
+        return int(np.count_nonzero(safe_dampened_reports(data.levels, data.lengths)))
 
-def is_safe_report(report: np.ndarray) -> bool:
-    d_min, d_max = minmax(np.diff(report))
+    def solve_stream(self, file_path: str) -> tuple[int, int]:
+        safe, safe_dampened = 0, 0
 
-    return 1 <= d_min <= d_max <= 3 or -3 <= d_min <= d_max <= -1
+        for chunk in iter_line_chunks(file_path):
+            levels, lengths = ragged_ints(chunk)
+            safe += int(np.count_nonzero(safe_reports(levels, lengths)))
+            safe_dampened += int(np.count_nonzero(safe_dampened_reports(levels, lengths)))
+
+        return safe, safe_dampened
+
+
+def bad_steps(steps: np.ndarray, sign: int) -> np.ndarray:
+    return (sign * steps < 1) | (sign * steps > 3)
+
+
+def valid_steps(levels: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    # Steps into the padding of shorter reports don't count
+    return np.arange(levels.shape[1] - 1) < (lengths - 1)[:, None]
+
+
+def safe_reports(levels: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    steps = np.diff(levels, axis=1)
+    valid = valid_steps(levels, lengths)
+
+    return np.logical_or.reduce([~(bad_steps(steps, sign) & valid).any(axis=1) for sign in (1, -1)])
+
+
+def safe_dampened_reports(levels: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    steps = np.diff(levels, axis=1)
+    valid = valid_steps(levels, lengths)
+    width = levels.shape[1]
+    removed = np.arange(width)
+
+    # Removing level k drops steps k - 1 and k, and adds the step from level k - 1 to k + 1 in their place
+    merged_steps = steps[:, :-1] + steps[:, 1:]
+    is_last = removed[1:-1] >= (lengths - 1)[:, None]
+    safe = np.zeros(len(levels), dtype=bool)
+
+    for sign in (1, -1):
+        # Bad steps before every level, so any range of steps is checked with two lookups
+        bad_before = np.zeros(levels.shape, dtype=np.int64)
+        np.cumsum(bad_steps(steps, sign) & valid, axis=1, out=bad_before[:, 1:])
+
+        before_ok = bad_before[:, np.maximum(removed - 1, 0)] == 0
+        after_ok = bad_before[:, -1:] == bad_before[:, np.minimum(removed + 1, width - 1)]
+        merged_ok = np.ones(levels.shape, dtype=bool)
+        merged_ok[:, 1:-1] = ~bad_steps(merged_steps, sign) | is_last
+
+        safe |= (before_ok & after_ok & merged_ok & (removed < lengths[:, None])).any(axis=1)
+
+    return safe
@@ -1,5 +1,4 @@
 from dataclasses import dataclass
-from functools import lru_cache
 
 from abstract_advent_day import *
 from data_reader import *
@@ -39,6 +38,7 @@ class AdventDay(AbstractAdventDay):
     def read(self, file_path: str) -> Data:
         return Data(read_lines(file_path))
 
+    @expected_complexity(1)
     @expected_answers(example_answer=126384, answer=212488)
     def puzzle_1(self, data: Data) -> int:
         return sum(
@@ -46,6 +46,7 @@ class AdventDay(AbstractAdventDay):
             for code in data.codes
         )
 
+    @expected_complexity(1)
     @expected_answers(example_answer=154115708116294, answer=258263972600402)
     def puzzle_2(self, data: Data) -> int:
         return sum(
@@ -62,7 +63,7 @@ def shortest_sequence(sequence: str, depth: int = 0, max_depth: int = 2) -> int:
         for char in sequence
     )
 
-@lru_cache(maxsize=None)
+@memo(max_size=1 << 12)
 def shortest_path(start: tuple[int, int], end: tuple[int, int], depth: int, max_depth: int) -> int:
     paths = collect_paths(start, end, avoid_pos=(3, 0) if depth == 0 else (0, 0))
 
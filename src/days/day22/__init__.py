@@ -1,45 +1,73 @@
-from collections import defaultdict
 from dataclasses import dataclass
 from abstract_advent_day import *
 from data_reader import *
 from util import *
 
 
-@dataclass(slots=True, frozen=True)
+@dataclass(slots=True, frozen=True, weakref_slot=True)
 class Data:
     buyers: list[int]
 
+# Windows of four price changes in -9..9 are indexed in base 19
+WINDOWS = 19 ** 4
+
 
 @advent_info(day=22)
 class AdventDay(AbstractAdventDay):
     def read(self, file_path: str) -> Data:
         return Data([*map(int, read_lines(file_path))])
 
+    @expected_complexity(1)
     @expected_answers(example_answer=37327623, answer=13429191512)
     def puzzle_1(self, data: Data) -> int:
-        return sum(generate_secret_numbers(buyer)[-1] for buyer in data.buyers)
+        return int(secret_numbers(data)[:, -1].sum())
 
+    @expected_complexity(1)
     @expected_answers(example_answer=(23,), answer=1582)
     def puzzle_2(self, data: Data) -> int:
-        sequences = [generate_secret_numbers(buyer) for buyer in data.buyers]
-        offers = [np.array(sequence) % 10 for sequence in sequences]
-        diffs = [np.diff(offer) for offer in offers]
+        offers = secret_numbers(data) % 10
+        diff = np.diff(offers) + 9
+        windows = ((diff[:, :-3] * 19 + diff[:, 1:-2]) * 19 + diff[:, 2:-1]) * 19 + diff[:, 3:]
+
+        # Only the first occurrence of a window counts for each buyer
+        buyer_windows = (windows + np.arange(len(offers))[:, None] * WINDOWS).ravel()
+        _, first = np.unique(buyer_windows, return_index=True)
+        window_price = np.bincount(buyer_windows[first] % WINDOWS, weights=offers[:, 4:].ravel()[first], minlength=WINDOWS)
+
+        return int(window_price.max())
+
+    def solve_stream(self, file_path: str) -> tuple[int, int]:
+        window_price = np.zeros(WINDOWS, dtype=np.int64)
+        secret_sum = 0
 
-        window_price = defaultdict(int)
-        for buyer in range(len(data.buyers)):
-            diff = diffs[buyer]
-            buyer_windows = set()
+        for line in iter_lines(file_path):
+            sequence = generate_secret_numbers(int(line))
+            secret_sum += sequence[-1]
 
-            for i in range(len(diff) - 3):
-                window = tuple(diff[i:i + 4])
+            offer = np.array(sequence) % 10
+            diff = np.diff(offer) + 9
+            windows = ((diff[:-3] * 19 + diff[1:-2]) * 19 + diff[2:-1]) * 19 + diff[3:]
 
-                if window in buyer_windows:
-                    continue
+            # Only the first occurrence of a window counts for each buyer
+            windows, first = np.unique(windows, return_index=True)
+            window_price[windows] += offer[first + 4]
 
-                window_price[window] += offers[buyer][i + 4]
-                buyer_windows.add(window)
+        return secret_sum, int(window_price.max())
 
-        return max(window_price.values())
+
+@stage
+def secret_numbers(data: Data) -> np.ndarray:
+    # All buyers at once, one row of secret numbers per buyer
+    sequence = np.empty((len(data.buyers), 2001), dtype=np.int64)
+    sequence[:, 0] = data.buyers
+
+    for i in range(2000):
+        n0 = sequence[:, i]
+        n1 = (n0 ^ (n0 << 6)) & 0xFFFFFF
+        n2 = (n1 ^ (n1 >> 5)) & 0xFFFFFF
+        sequence[:, i + 1] = (n2 ^ (n2 << 11)) & 0xFFFFFF
+
+    return sequence
 
 
 def generate_secret_numbers(initial: int, repeat: int = 2000) -> list[int]:
@@ -1,6 +1,5 @@
-from collections import defaultdict, deque
+from collections import defaultdict
 from dataclasses import dataclass
-from functools import lru_cache
 
 from abstract_advent_day import *
 from data_reader import *
@@ -46,52 +45,30 @@ class AdventDay(AbstractAdventDay):
     @expected_answers(example_answer='co,de,ka,ta', answer='df,kg,la,mp,pb,qh,sk,th,vn,ww,xp,yp,zk')
     def puzzle_2(self, data: Data) -> str:
         network = find_largest_network(data)
+        return ','.join(sorted(find_largest_inner_network(data, network, None, frozenset())))
 
-        @lru_cache(maxsize=None)
-        def find_largest_inner_network(current: str = None, selection_str: str = '') -> str:
-            connections = data.connections[current] if current else network
-            selection = set(selection_str.split(',') if selection_str else [])
+@memo(max_size=1 << 17, scope='call', key=lambda data, network, current, selection: (current, selection))
+def find_largest_inner_network(data: Data, network: set[str], current: str | None, selection: frozenset[str]) -> frozenset[str]:
+    connections = data.connections[current] if current else network
 
-            inner_networks = [selection_str]
-            for connected_pc in connections:
-                if connected_pc in selection or not selection.issubset(data.connections[connected_pc]):
-                    continue
-
-                inner_networks.append(find_largest_inner_network(connected_pc, ','.join(sorted([*selection, connected_pc]))))
-
-            return max(inner_networks, key=len)
-
-        return find_largest_inner_network()
-
-def find_largest_network(data: Data) -> set[str]:
-    largest_network = set()
-
-    visited = set()
-    for pc in data.connections.keys():
-        if pc in visited:
+    inner_networks = [selection]
+    for connected_pc in connections:
+        if connected_pc in selection or not selection.issubset(data.connections[connected_pc]):
             continue
 
-        network = set()
-        queue = deque([pc])
+        inner_networks.append(find_largest_inner_network(data, network, connected_pc, selection | {connected_pc}))
 
-        while queue:
-            current_pc = queue.popleft()
+    return max(inner_networks, key=len)
 
-            if current_pc in network:
-                continue
-
-            visited.add(current_pc)
-            network.add(current_pc)
-
-            for connected_pc in data.connections[current_pc]:
-                if connected_pc in network:
-                    continue
-
-                queue.append(connected_pc)
-
-        if len(network) > len(largest_network):
-            largest_network = network
+def find_largest_network(data: Data) -> set[str]:
+    pcs = [*data.connections.keys()]
+    ids = {pc: i for i, pc in enumerate(pcs)}
 
-    return largest_network
+    networks = UnionFind(len(pcs))
+    for pc, connected_pcs in data.connections.items():
+        for connected_pc in connected_pcs:
+            networks.union(ids[pc], ids[connected_pc])
 
+    largest = max(networks.roots(), key=networks.size)
 
+    return {pc for pc in pcs if networks.find(ids[pc]) == largest}
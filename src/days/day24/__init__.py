@@ -78,31 +78,18 @@ class AdventDay(AbstractAdventDay):
         if data.is_example:
             return ''
 
-        output_gates = {}
-        def find_output_gates(node: str, ignore: set[str]) -> set[str]:
-            if node in data.inputs or node in ignore:
-                return set()
-
-            if node not in output_gates:
-                gate = data.gates[node]
-                left_gates = find_output_gates(gate.left, ignore)
-                right_gates = find_output_gates(gate.right, ignore)
-                output_gates[node] = left_gates | right_gates
-
-            return output_gates[node] | {node}
-
         visited = set()
         for z_output in sorted(filter(lambda k: k[0] == 'z', data.gates.keys())):
-            visited |= find_output_gates(z_output, visited)
+            visited |= feeding_gates(data, z_output, visited)
 
         swapped_gates = {}
-        for i in range(1, 45):
+        for i in range(1, sum(node[0] == 'x' for node in data.inputs)):
             if output_works_as_expected(data, i, swapped_gates):
                 continue
 
             zi = f'z{i:02d}'
             zi_plus = f'z{(i + 1):02d}'
-            potential_gates = {zi} | output_gates[zi] | output_gates[zi_plus]
+            potential_gates = {zi} | find_output_gates(data, zi, visited) | find_output_gates(data, zi_plus, visited)
             for a, b in combinations(potential_gates, 2):
                 test_swap = swapped_gates | {
                     a: b,
@@ -116,6 +103,20 @@ class AdventDay(AbstractAdventDay):
         return ','.join(sorted(swapped_gates.keys()))
 
 
+# Gates ignored by the first call for a node stay excluded, so only the node is part of the key.
+# The bound is far above the number of wires, an eviction would change which gates are ignored
+@memo(max_size=1 << 16, scope='call', key=lambda data, node, ignore: node)
+def find_output_gates(data: Data, node: str, ignore: set[str]) -> set[str]:
+    gate = data.gates[node]
+    return feeding_gates(data, gate.left, ignore) | feeding_gates(data, gate.right, ignore)
+
+def feeding_gates(data: Data, node: str, ignore: set[str]) -> set[str]:
+    if node in data.inputs or node in ignore:
+        return set()
+
+    return find_output_gates(data, node, ignore) | {node}
+
+
 def output_works_as_expected(data: Data, i: int, swap: dict[str, str]) -> bool:
     xi = f'x{i:02d}'
     yi = f'y{i:02d}'
@@ -22,6 +22,7 @@ class AdventDay(AbstractAdventDay):
 
         return Data(np.array(locks), np.array(keys))
 
+    @expected_complexity(2)
     @expected_answers(example_answer=3, answer=3114)
     def puzzle_1(self, data: Data) -> int:
         # - Lay each key over each lock by addition
@@ -1,11 +1,15 @@
 import re
 from dataclasses import dataclass
-from re import RegexFlag
+from typing import Iterable
 
 from abstract_advent_day import *
 from data_reader import *
 from util import *
 
+INSTRUCTION_REGEX = re.compile(r"mul\((\d{1,3}),(\d{1,3})\)|(do\(\))|don't\(\)")
+MAX_INSTRUCTION_LENGTH = len('mul(123,456)')
+CHUNK_SIZE = 1 << 20
+
 
 @dataclass(slots=True, frozen=True)
 class Data:
@@ -19,39 +23,37 @@ class AdventDay(AbstractAdventDay):
 
     @expected_answers(example_answer=(161,161), answer=155955228)
     def puzzle_1(self, data: Data) -> int:
-        return sum([a * b for a, b in find_multiplications(data.instructions)])
+        return run_instructions([data.instructions])[0]
 
     @expected_answers(example_answer=(161,48), answer=100189366)
     def puzzle_2(self, data: Data) -> int:
-        enabled_sections = []
-        start = 0
+        return run_instructions([data.instructions])[1]
 
-        for match in re.finditer(r"(?P<do>do\(\))|(?P<dont>don't\(\))", data.instructions, RegexFlag.MULTILINE):
-            if match.group('do') and start is None:
-                start = match.end()
-            elif match.group('dont') and start is not None:
-                enabled_sections.append((start, match.start()))
-                start = None
+    def solve_stream(self, file_path: str) -> tuple[int, int]:
+        return run_instructions(iter_chunks(file_path, CHUNK_SIZE))
 
-        if start is not None:
-            enabled_sections.append((start, len(data.instructions)))
+def run_instructions(chunks: Iterable[str]) -> tuple[int, int]:
+    total, enabled_total = 0, 0
+    enabled = True
+    rest = ''
 
-        return sum([a * b for a, b in find_multiplications(data.instructions, enabled_sections)])
+    for chunk in chunks:
+        buffer = rest + chunk
+        end = 0
 
-def find_multiplications(instructions: str, enabled_sections: list[tuple[int, int]] = None) -> list[tuple[int, int]]:
-    if enabled_sections is None:
-        enabled_sections = [(0, len(instructions))]
+        for match in INSTRUCTION_REGEX.finditer(buffer):
+            a, b, do = match.groups()
 
-    mul_matches = re.finditer(r"mul\((?P<a>\d{1,3}),(?P<b>\d{1,3})\)", instructions, RegexFlag.MULTILINE)
+            if a:
+                product = int(a) * int(b)
+                total += product
+                enabled_total += product if enabled else 0
+            else:
+                enabled = do is not None
 
-    return [
-        (int(match.group('a')), int(match.group('b')))
-        for match in mul_matches if pos_in_ranges(match.start(), enabled_sections)
-    ]
+            end = match.end()
 
-def pos_in_ranges(pos: int, ranges: list[tuple[int, int]]) -> bool:
-    for start, end in ranges:
-        if start <= pos <= end:
-            return True
+        # An instruction cut off by the chunk boundary starts in the last few characters, they are scanned again with the next chunk
+        rest = buffer[max(end, len(buffer) - MAX_INSTRUCTION_LENGTH + 1):]
 
-    return False
+    return total, enabled_total
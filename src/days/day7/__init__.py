@@ -12,13 +12,9 @@ class Data:
 @advent_info(day=7)
 class AdventDay(AbstractAdventDay):
     def read(self, file_path: str) -> Data:
-        equations = []
-        for line in read_lines(file_path):
-            result, params = split_once(line, ": ")
-            equations.append((int(result), [*map(int, params.split(' '))]))
-
-        return Data(equations)
+        return Data([*map(parse_equation, read_lines(file_path))])
 
+    @expected_complexity(1)
     @expected_answers(example_answer=3749, answer=465126289353)
     def puzzle_1(self, data: Data) -> int:
         return sum(
@@ -27,6 +23,7 @@ class AdventDay(AbstractAdventDay):
             if can_produce_valid_equation(params[0], params[1:], goal, ['*', '+'])
         )
 
+    @expected_complexity(1)
     @expected_answers(example_answer=11387, answer=70597497486371)
     def puzzle_2(self, data: Data) -> int:
         return sum(
@@ -35,6 +32,25 @@ class AdventDay(AbstractAdventDay):
             if can_produce_valid_equation(params[0], params[1:], goal, ['*', '+', '||'])
         )
 
+    def solve_stream(self, file_path: str) -> tuple[int, int]:
+        total, total_with_concat = 0, 0
+
+        for line in iter_lines(file_path):
+            goal, params = parse_equation(line)
+
+            # Valid without concatenation means valid with it as well
+            if can_produce_valid_equation(params[0], params[1:], goal, ['*', '+']):
+                total += goal
+                total_with_concat += goal
+            elif can_produce_valid_equation(params[0], params[1:], goal, ['*', '+', '||']):
+                total_with_concat += goal
+
+        return total, total_with_concat
+
+def parse_equation(line: str) -> tuple[int, list[int]]:
+    result, params = split_once(line, ": ")
+    return int(result), [*map(int, params.split(' '))]
+
 OPERATORS = {
     '*': lambda a, b: a * b,
     '+': lambda a, b: a + b,
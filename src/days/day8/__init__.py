@@ -7,6 +7,8 @@ from abstract_advent_day import *
 from data_reader import *
 from util import *
 
+EMPTY = ord('.')
+
 
 @dataclass(slots=True, frozen=True)
 class Data:
@@ -17,10 +19,10 @@ class Data:
 @advent_info(day=8)
 class AdventDay(AbstractAdventDay):
     def read(self, file_path: str) -> Data:
-        grid = read_str_matrix(file_path)
+        grid = read_byte_grid(file_path)
 
         antenna_pairs = []
-        for antenna_type in np.unique(grid[grid != '.'].flatten()):
+        for antenna_type in np.unique(grid[grid != EMPTY].flatten()):
             antenna_coords = np.argwhere(grid == antenna_type)
 
             for [y1, x1], [y2, x2] in combinations(antenna_coords, r=2):
@@ -33,7 +35,8 @@ class AdventDay(AbstractAdventDay):
 
     @expected_answers(example_answer=14, answer=323)
     def puzzle_1(self, data: Data) -> int:
-        antinodes = set()
+        antinodes = CoordSet(data.grid.size)
+        width = data.grid.shape[1]
 
         for [y1, x1], [y2, x2] in data.antenna_pairs:
             dy = y2 - y1
@@ -44,17 +47,18 @@ class AdventDay(AbstractAdventDay):
                 (y1 - dy, x1 - dx) if (y1 - dy, x1 - dx) != (y2, x2) else (y2 - dy, x2 - dx),
             ]:
                 if in_2d_grid(data.grid, y, x):
-                    antinodes.add((y, x))
+                    antinodes.add(y * width + x)
 
         return len(antinodes)
 
     @expected_answers(example_answer=34, answer=1077)
     def puzzle_2(self, data: Data) -> int:
-        antinodes = set()
+        antinodes = CoordSet(data.grid.size)
+        width = data.grid.shape[1]
 
         for [y1, x1], [y2, x2] in data.antenna_pairs:
-            antinodes.add((y1, x1))
-            antinodes.add((y2, x2))
+            antinodes.add(y1 * width + x1)
+            antinodes.add(y2 * width + x2)
 
             dy = y2 - y1
             dx = x2 - x1
@@ -63,12 +67,12 @@ class AdventDay(AbstractAdventDay):
             yb, xb = (y1 - dy, x1 - dx) if (y1 - dy, x1 - dx) != (y2, x2) else (y2 - dy, x2 - dx)
 
             while in_2d_grid(data.grid, ya, xa):
-                antinodes.add((ya, xa))
+                antinodes.add(ya * width + xa)
                 ya += dy
                 xa += dx
 
             while in_2d_grid(data.grid, yb, xb):
-                antinodes.add((yb, xb))
+                antinodes.add(yb * width + xb)
                 yb -= dy
                 xb -= dx
 
@@ -87,6 +87,9 @@ class AdventDay(AbstractAdventDay):
         position = 0
 
         for i, free_space in enumerate(free_spaces):
+            if len(files) == 0:
+                break
+
             next_file_id, next_file_size = files[0]
 
             for _ in range(next_file_size):
@@ -0,0 +1,109 @@
+import inspect
+import os
+import sys
+from dataclasses import fields, is_dataclass
+from typing import Callable
+
+from lazy_import import lazy_import
+
+# Only needed when the disk cache is enabled
+hashlib = lazy_import('hashlib')
+np = lazy_import('numpy')
+pickle = lazy_import('pickle')
+shutil = lazy_import('shutil')
+tempfile = lazy_import('tempfile')
+
+# Bump when the on-disk layout changes
+CACHE_VERSION = 1
+
+
+class DiskCache:
+    __slots__ = ('root',)
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def key(self, day_type: type, file_path: str) -> str:
+        digest = hashlib.sha256(f'{CACHE_VERSION}:{sys.version_info[:2]}:{np.__version__}'.encode())
+
+        with open(inspect.getsourcefile(sys.modules[day_type.__module__]), 'rb') as f:
+            digest.update(f.read())
+
+        with open(file_path, 'rb') as f:
+            while chunk := f.read(1 << 20):
+                digest.update(chunk)
+
+        return f'{day_type.__module__}-{digest.hexdigest()[:32]}'
+
+    def entry_dir(self, day_type: type, file_path: str) -> str:
+        return os.path.join(self.root, self.key(day_type, file_path))
+
+    def get(self, day_type: type, file_path: str, load: Callable[[str], object]) -> object:
+        return self.get_entry(self.entry_dir(day_type, file_path), lambda: load(file_path))
+
+    def get_entry(self, entry_dir: str, load: Callable[[], object]) -> object:
+        if os.path.isdir(entry_dir):
+            return load_entry(entry_dir)
+
+        data = load()
+        self.store(entry_dir, data)
+
+        return data
+
+    def get_stage(self, entry_dir: str, name: str, compute: Callable[[], object]) -> object:
+        # Derived results are stored next to the parsed input they were computed from
+        return self.get_entry(os.path.join(entry_dir, 'stages', name), compute)
+
+    def store(self, entry_dir: str, data: object):
+        os.makedirs(os.path.dirname(entry_dir), exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(entry_dir), prefix='.tmp-')
+
+        try:
+            save_entry(tmp_dir, data)
+            os.replace(tmp_dir, entry_dir)
+        except OSError:
+            # Another process stored the same entry first
+            pass
+        finally:
+            # Gone after a successful replace, otherwise a partial entry that must not stay behind
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def save_entry(entry_dir: str, data: object):
+    if not is_dataclass(data):
+        header = {'type': None, 'data': data, 'arrays': []}
+    else:
+        values = {field.name: getattr(data, field.name) for field in fields(data)}
+        arrays = [
+            name for name, value in values.items()
+            if isinstance(value, np.ndarray) and value.size > 0 and not value.dtype.hasobject
+        ]
+
+        # NumPy fields are stored as plain .npy files, since members of an .npz can't be memory-mapped
+        for name in arrays:
+            np.save(os.path.join(entry_dir, f'{name}.npy'), values.pop(name))
+
+        header = {'type': type(data), 'data': values, 'arrays': arrays}
+
+    with open(os.path.join(entry_dir, 'data.pkl'), 'wb') as f:
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_entry(entry_dir: str) -> object:
+    with open(os.path.join(entry_dir, 'data.pkl'), 'rb') as f:
+        header = pickle.load(f)
+
+    if header['type'] is None:
+        return header['data']
+
+    values = header['data']
+    for name in header['arrays']:
+        values[name] = np.load(os.path.join(entry_dir, f'{name}.npy'), mmap_mode='r')
+
+    return header['type'](**values)
+
+
+disk_cache = DiskCache(os.environ['ADVENT_DISK_CACHE']) if os.environ.get('ADVENT_DISK_CACHE') else None
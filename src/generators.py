@@ -0,0 +1,488 @@
+import argparse
+import os
+import random
+import string
+import sys
+from typing import Callable
+
+type Generator = Callable[[random.Random, int], str]
+
+GENERATORS: dict[int, Generator] = {}
+
+
+def generator(day: int):
+    def decorator(func: Generator) -> Generator:
+        GENERATORS[day] = func
+        return func
+
+    return decorator
+
+
+def generate_input(day: int, size: int, seed: int = 0) -> str:
+    return GENERATORS[day](random.Random(f'{day}:{size}:{seed}'), size)
+
+
+def write_input(day: int, size: int, directory: str, seed: int = 0) -> str:
+    # File names must not contain 'example', several days switch to the example dimensions on that
+    os.makedirs(directory, exist_ok=True)
+    file_path = os.path.join(directory, f'day{day}_size{size}_seed{seed}.txt')
+
+    with open(file_path, 'w') as f:
+        f.write(generate_input(day, size, seed))
+
+    return file_path
+
+
+def grid_to_str(grid: list[list[str]]) -> str:
+    return '\n'.join(''.join(row) for row in grid)
+
+
+@generator(day=1)
+def location_lists(rng: random.Random, size: int) -> str:
+    return '\n'.join(f'{rng.randint(10000, 99999)}   {rng.randint(10000, 99999)}' for _ in range(size))
+
+
+@generator(day=2)
+def reports(rng: random.Random, size: int) -> str:
+    lines = []
+
+    for _ in range(size):
+        level = rng.randint(1, 99)
+        direction = rng.choice([-1, 1])
+        report = [level]
+
+        for _ in range(rng.randint(4, 7)):
+            step = rng.randint(1, 3) if rng.random() < 0.9 else rng.randint(-3, 5)
+            report.append(report[-1] + direction * step)
+
+        lines.append(' '.join(map(str, report)))
+
+    return '\n'.join(lines)
+
+
+@generator(day=3)
+def corrupted_memory(rng: random.Random, size: int) -> str:
+    tokens = []
+
+    for _ in range(size):
+        roll = rng.random()
+
+        if roll < 0.6:
+            tokens.append(f'mul({rng.randint(1, 999)},{rng.randint(1, 999)})')
+        elif roll < 0.7:
+            tokens.append('do()')
+        elif roll < 0.8:
+            tokens.append("don't()")
+        else:
+            tokens.append(rng.choice(['mul(4*', 'mul[3,7]', 'mul ( 2 , 4 )', 'mul(32,64]', 'do_not_', "don't", '?(mul(']))
+
+        tokens.append(''.join(rng.choices(string.punctuation + 'adlmnotu \n', k=rng.randint(0, 8))))
+
+    return ''.join(tokens)
+
+
+@generator(day=4)
+def word_search(rng: random.Random, size: int) -> str:
+    return grid_to_str([rng.choices('XMAS', k=size) for _ in range(size)])
+
+
+@generator(day=5)
+def print_queue(rng: random.Random, size: int) -> str:
+    pages = rng.sample(range(10, 100), 49)
+
+    # Rules between every pair of pages, following one order
+    rules = [(pages[i], pages[j]) for i in range(len(pages)) for j in range(i + 1, len(pages))]
+    rng.shuffle(rules)
+
+    updates = []
+    for _ in range(size):
+        update = rng.sample(pages, rng.randrange(5, 24, 2))
+
+        if rng.random() < 0.5:
+            update.sort(key=pages.index)
+
+        updates.append(','.join(map(str, update)))
+
+    return '\n'.join(f'{before}|{after}' for before, after in rules) + '\n\n' + '\n'.join(updates)
+
+
+@generator(day=6)
+def guard_lab(rng: random.Random, size: int) -> str:
+    directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+
+    # Retry until the guard leaves the lab, puzzle 1 never ends otherwise
+    while True:
+        grid = [['#' if rng.random() < 0.03 else '.' for _ in range(size)] for _ in range(size)]
+        start = (rng.randrange(size), rng.randrange(size))
+        grid[start[0]][start[1]] = '.'
+
+        (y, x), direction, seen = start, 0, set()
+        while 0 <= y < size and 0 <= x < size and (y, x, direction) not in seen:
+            seen.add((y, x, direction))
+            dy, dx = directions[direction]
+
+            if 0 <= y + dy < size and 0 <= x + dx < size and grid[y + dy][x + dx] == '#':
+                direction = (direction + 1) % 4
+            else:
+                y, x = y + dy, x + dx
+
+        if not (0 <= y < size and 0 <= x < size):
+            grid[start[0]][start[1]] = '^'
+            return grid_to_str(grid)
+
+
+@generator(day=7)
+def bridge_repair(rng: random.Random, size: int) -> str:
+    lines = []
+
+    for _ in range(size):
+        params = [rng.randint(1, 999) for _ in range(rng.randint(2, 12))]
+        goal = params[0]
+
+        for param in params[1:]:
+            operator = rng.choice(['+', '*', '||'])
+            goal = goal + param if operator == '+' else goal * param if operator == '*' else int(f'{goal}{param}')
+
+        if rng.random() < 0.5:
+            goal += 1
+
+        lines.append(f'{goal}: {' '.join(map(str, params))}')
+
+    return '\n'.join(lines)
+
+
+@generator(day=8)
+def antennas(rng: random.Random, size: int) -> str:
+    grid = [['.'] * size for _ in range(size)]
+
+    for _ in range(max(1, size * size // 50)):
+        grid[rng.randrange(size)][rng.randrange(size)] = rng.choice(string.digits + string.ascii_letters)
+
+    return grid_to_str(grid)
+
+
+@generator(day=9)
+def disk_map(rng: random.Random, size: int) -> str:
+    length = size if size % 2 == 1 else size + 1
+    return ''.join(str(rng.randint(1, 9) if i % 2 == 0 else rng.randint(0, 9)) for i in range(length))
+
+
+@generator(day=10)
+def topographic_map(rng: random.Random, size: int) -> str:
+    # Blocks of diagonal slopes contain many hiking trails, the noise breaks them up
+    block = 8
+    offsets = [[rng.randrange(10) for _ in range(size // block + 1)] for _ in range(size // block + 1)]
+
+    return grid_to_str([
+        [
+            str(rng.randrange(10) if rng.random() < 0.1 else (y + x + offsets[y // block][x // block]) % 10)
+            for x in range(size)
+        ]
+        for y in range(size)
+    ])
+
+
+@generator(day=11)
+def stones(rng: random.Random, size: int) -> str:
+    return ' '.join(str(rng.randint(0, 1_000_000)) for _ in range(size))
+
+
+@generator(day=12)
+def garden(rng: random.Random, size: int) -> str:
+    block = 4
+    plots = [rng.choices(string.ascii_uppercase, k=size // block + 1) for _ in range(size // block + 1)]
+
+    return grid_to_str([
+        [
+            rng.choice(string.ascii_uppercase) if rng.random() < 0.05 else plots[y // block][x // block]
+            for x in range(size)
+        ]
+        for y in range(size)
+    ])
+
+
+@generator(day=13)
+def claw_machines(rng: random.Random, size: int) -> str:
+    machines = []
+
+    for _ in range(size):
+        # The buttons of the puzzle inputs are never parallel
+        ax, ay, bx, by = 1, 1, 1, 1
+        while ax * by == ay * bx:
+            ax, ay, bx, by = (rng.randint(10, 99) for _ in range(4))
+
+        if rng.random() < 0.5:
+            a, b = rng.randint(0, 100), rng.randint(0, 100)
+            x, y = a * ax + b * bx, a * ay + b * by
+        else:
+            x, y = rng.randint(1000, 20000), rng.randint(1000, 20000)
+
+        machines.append(f'Button A: X+{ax}, Y+{ay}\nButton B: X+{bx}, Y+{by}\nPrize: X={x}, Y={y}')
+
+    return '\n\n'.join(machines)
+
+
+@generator(day=14)
+def robots(rng: random.Random, size: int) -> str:
+    width, height = 101, 103
+    count = min(size, width * height)
+
+    # Rewind distinct positions from a random moment, so puzzle 2 finds a step without overlapping robots
+    target = rng.randrange(width * height)
+    positions = rng.sample([(x, y) for x in range(width) for y in range(height)], count)
+
+    lines = []
+    for x, y in positions:
+        dx, dy = rng.randint(-100, 100), rng.randint(-100, 100)
+        lines.append(f'p={(x - dx * target) % width},{(y - dy * target) % height} v={dx},{dy}')
+
+    return '\n'.join(lines)
+
+
+@generator(day=15)
+def warehouse(rng: random.Random, size: int) -> str:
+    grid = [
+        ['#' if y in (0, size - 1) or x in (0, size - 1) else rng.choices('#O.', weights=[5, 15, 80])[0] for x in range(size)]
+        for y in range(size)
+    ]
+    grid[size // 2][size // 2] = '@'
+
+    moves = ''.join(rng.choices('<>^v', k=size * 10))
+
+    return grid_to_str(grid) + '\n\n' + '\n'.join(moves[i:i + 70] for i in range(0, len(moves), 70))
+
+
+@generator(day=16)
+def reindeer_maze(rng: random.Random, size: int) -> str:
+    cells = max(2, size // 2)
+    length = cells * 2 + 1
+    grid = [['#'] * length for _ in range(length)]
+
+    # Depth first maze, with a few extra openings for alternative routes
+    stack, visited = [(cells - 1, 0)], {(cells - 1, 0)}
+    grid[cells * 2 - 1][1] = '.'
+
+    while stack:
+        cy, cx = stack[-1]
+        options = [
+            (cy + dy, cx + dx) for dy, dx in [(-1, 0), (1, 0), (0, -1), (0, 1)]
+            if 0 <= cy + dy < cells and 0 <= cx + dx < cells and (cy + dy, cx + dx) not in visited
+        ]
+
+        if not options:
+            stack.pop()
+            continue
+
+        ny, nx = rng.choice(options)
+        grid[cy + ny + 1][cx + nx + 1] = '.'
+        grid[ny * 2 + 1][nx * 2 + 1] = '.'
+        visited.add((ny, nx))
+        stack.append((ny, nx))
+
+    for _ in range(cells * cells // 50):
+        y, x = rng.randrange(1, length - 1), rng.randrange(1, length - 1)
+
+        if (y + x) % 2 == 1:
+            grid[y][x] = '.'
+
+    grid[length - 2][1] = 'S'
+    grid[1][length - 2] = 'E'
+
+    return grid_to_str(grid)
+
+
+@generator(day=17)
+def chronospatial_computer(rng: random.Random, size: int) -> str:
+    # Same shape as the puzzle inputs; the size is the number of 3-bit words in register A
+    a, b = rng.randrange(8), rng.randrange(8)
+    program = [2, 4, 1, a, 7, 5, 1, b, 4, rng.randrange(8), 0, 3, 5, 5, 3, 0]
+
+    return (
+        f'Register A: {rng.randrange(8 ** (size - 1), 8 ** size)}\n'
+        f'Register B: 0\n'
+        f'Register C: 0\n'
+        f'\n'
+        f'Program: {','.join(map(str, program))}'
+    )
+
+
+@generator(day=18)
+def falling_bytes(rng: random.Random, size: int) -> str:
+    # Keep a random monotone route free during the first kilobyte, so puzzle 1 has a path
+    x, y, route = 0, 0, set()
+    while (x, y) != (70, 70):
+        route.add((x, y))
+        x, y = (x + 1, y) if y == 70 or (x < 70 and rng.random() < 0.5) else (x, y + 1)
+
+    cells = [(x, y) for x in range(71) for y in range(71) if (x, y) not in route | {(70, 70)}]
+    rng.shuffle(cells)
+    rest = cells[1024:] + sorted(route - {(0, 0)})
+    rng.shuffle(rest)
+
+    return '\n'.join(f'{x},{y}' for x, y in (cells[:1024] + rest)[:size])
+
+
+@generator(day=19)
+def towel_patterns(rng: random.Random, size: int) -> str:
+    # Without a single 'g' towel some patterns can't be made
+    towels = {'w', 'u', 'b', 'r'}
+    while len(towels) < 400:
+        towels.add(''.join(rng.choices('wubrg', k=rng.randint(2, 8))))
+
+    towels = sorted(towels)
+    patterns = []
+    for _ in range(size):
+        pattern, length = '', rng.randint(20, 60)
+        while len(pattern) < length:
+            pattern += rng.choice(towels)
+
+        if rng.random() < 0.2:
+            position = rng.randrange(len(pattern))
+            pattern = pattern[:position] + 'g' + pattern[position:]
+
+        patterns.append(pattern)
+
+    return ', '.join(rng.sample(towels, len(towels))) + '\n\n' + '\n'.join(patterns)
+
+
+@generator(day=20)
+def race_track(rng: random.Random, size: int) -> str:
+    cells = max(2, size // 2)
+    length = cells * 2 + 1
+    grid = [['#'] * length for _ in range(length)]
+
+    # A single corridor without branches: walk to the unvisited neighbour with the fewest free neighbours
+    def free_neighbours(cell: tuple[int, int]) -> list[tuple[int, int]]:
+        return [
+            (cell[0] + dy, cell[1] + dx) for dy, dx in [(-1, 0), (1, 0), (0, -1), (0, 1)]
+            if 0 <= cell[0] + dy < cells and 0 <= cell[1] + dx < cells and (cell[0] + dy, cell[1] + dx) not in visited
+        ]
+
+    current = (rng.randrange(cells), rng.randrange(cells))
+    visited = {current}
+    grid[current[0] * 2 + 1][current[1] * 2 + 1] = 'S'
+
+    while options := free_neighbours(current):
+        rng.shuffle(options)
+        ny, nx = min(options, key=lambda option: len(free_neighbours(option)))
+        grid[current[0] + ny + 1][current[1] + nx + 1] = '.'
+        grid[ny * 2 + 1][nx * 2 + 1] = '.'
+        visited.add((ny, nx))
+        current = (ny, nx)
+
+    grid[current[0] * 2 + 1][current[1] * 2 + 1] = 'E'
+
+    return grid_to_str(grid)
+
+
+@generator(day=21)
+def door_codes(rng: random.Random, size: int) -> str:
+    return '\n'.join(f'{rng.randrange(1000):03d}A' for _ in range(size))
+
+
+@generator(day=22)
+def buyers(rng: random.Random, size: int) -> str:
+    return '\n'.join(str(rng.randrange(1, 16777216)) for _ in range(size))
+
+
+@generator(day=23)
+def lan_party(rng: random.Random, size: int) -> str:
+    names = rng.sample([a + b for a in string.ascii_lowercase for b in string.ascii_lowercase], min(max(size, 14), 676))
+    edges = set()
+
+    for name in names:
+        for other in rng.sample(names, min(len(names), 12)):
+            if other != name:
+                edges.add(tuple(sorted((name, other))))
+
+    # Plant one larger clique for puzzle 2
+    clique = rng.sample(names, 13)
+    edges |= {tuple(sorted((a, b))) for a in clique for b in clique if a < b}
+
+    edges = sorted(edges)
+    rng.shuffle(edges)
+
+    return '\n'.join(f'{a}-{b}' if rng.random() < 0.5 else f'{b}-{a}' for a, b in edges)
+
+
+@generator(day=24)
+def crossed_wires(rng: random.Random, size: int) -> str:
+    bits = max(2, min(size, 99))
+    names = set()
+
+    def new_name() -> str:
+        while (name := ''.join(rng.choices(string.ascii_lowercase[:23], k=3))) in names:
+            pass
+
+        names.add(name)
+        return name
+
+    # Ripple carry adder; the z outputs are renamed afterwards
+    gates = [('x00', 'XOR', 'y00', 'z00')]
+    carry = new_name()
+    gates.append(('x00', 'AND', 'y00', carry))
+    swappable = []
+
+    for i in range(1, bits):
+        half_sum, half_carry, carry_through, carry_out = new_name(), new_name(), new_name(), new_name()
+        gates += [
+            (f'x{i:02d}', 'XOR', f'y{i:02d}', half_sum),
+            (f'x{i:02d}', 'AND', f'y{i:02d}', half_carry),
+            (half_sum, 'XOR', carry, f'z{i:02d}'),
+            (half_sum, 'AND', carry, carry_through),
+            (half_carry, 'OR', carry_through, carry_out),
+        ]
+        # Swapping outputs of gates with the same inputs never creates a cycle
+        swappable.append((len(gates) - 5, len(gates) - 4))
+        swappable.append((len(gates) - 3, len(gates) - 2))
+        carry = carry_out
+
+    gates = [(a, op, b, f'z{bits:02d}' if out == carry else out) for a, op, b, out in gates]
+
+    for first, second in rng.sample(swappable, min(4, len(swappable))):
+        (a1, op1, b1, out1), (a2, op2, b2, out2) = gates[first], gates[second]
+        gates[first], gates[second] = (a1, op1, b1, out2), (a2, op2, b2, out1)
+
+    rng.shuffle(gates)
+    inputs = [f'{wire}{i:02d}: {rng.randint(0, 1)}' for wire in 'xy' for i in range(bits)]
+
+    return '\n'.join(inputs) + '\n\n' + '\n'.join(
+        f'{a} {op} {b} -> {out}' if rng.random() < 0.5 else f'{b} {op} {a} -> {out}'
+        for a, op, b, out in gates
+    )
+
+
+@generator(day=25)
+def schematics(rng: random.Random, size: int) -> str:
+    grids = []
+
+    for _ in range(size):
+        heights = [rng.randint(0, 5) for _ in range(5)]
+        rows = [''.join('#' if height >= row else '.' for height in heights) for row in range(1, 6)]
+
+        if rng.random() < 0.5:
+            grids.append('\n'.join(['#####', *rows, '.....']))
+        else:
+            grids.append('\n'.join(['.....', *reversed(rows), '#####']))
+
+    return '\n\n'.join(grids)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m generators', description='Generate a synthetic puzzle input')
+    parser.add_argument('day', type=int, choices=sorted(GENERATORS))
+    parser.add_argument('size', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write to this directory instead of stdout')
+    args = parser.parse_args(argv)
+
+    if args.output:
+        print(write_input(args.day, args.size, args.output, args.seed))
+    else:
+        print(generate_input(args.day, args.size, args.seed))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,121 @@
+import os
+import sys
+from collections import OrderedDict
+from typing import Callable
+
+type CacheKey = tuple[str, str, int, int]
+
+
+def estimate_size(obj: object, seen: set[int] | None = None) -> int:
+    if seen is None:
+        seen = set()
+
+    if id(obj) in seen:
+        return 0
+
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+
+    # NumPy arrays include their own data in sys.getsizeof, views count the object owning the buffer, once
+    if hasattr(obj, 'nbytes') and hasattr(obj, 'dtype'):
+        return size if obj.base is None else size + estimate_size(obj.base, seen)
+
+    # sys.getsizeof already includes the buffer of bytes and bytearray
+    if isinstance(obj, (bytes, bytearray, str)):
+        return size
+
+    if isinstance(obj, memoryview):
+        return size + estimate_size(obj.obj, seen)
+
+    if isinstance(obj, dict):
+        return size + sum(estimate_size(k, seen) + estimate_size(v, seen) for k, v in obj.items())
+
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(estimate_size(item, seen) for item in obj)
+
+    if isinstance(obj, (int, float, complex, bool, type(None), type)):
+        return size
+
+    # Other buffer owners, like the mmap behind a file mapped array
+    try:
+        with memoryview(obj) as view:
+            return size + view.nbytes
+    except TypeError:
+        pass
+
+    return size + sum(estimate_size(value, seen) for value in attribute_values(obj))
+
+
+def attribute_values(obj: object) -> list[object]:
+    # Instance attributes of plain, slotted and dataclass objects alike
+    values = [*getattr(obj, '__dict__', {}).values()]
+
+    for cls in type(obj).__mro__:
+        slots = cls.__dict__.get('__slots__', ())
+
+        for name in [slots] if isinstance(slots, str) else slots:
+            if name not in ('__dict__', '__weakref__') and hasattr(obj, name):
+                values.append(getattr(obj, name))
+
+    return values
+
+
+class InputCache:
+    __slots__ = ('max_bytes', 'entries', 'total_bytes', 'hits', 'misses')
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict[CacheKey, tuple[object, int]] = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, namespace: str, file_path: str, load: Callable[[str], object]) -> object:
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        key = (namespace, path, stat.st_mtime_ns, stat.st_size)
+
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key][0]
+
+        self.misses += 1
+
+        # An older version of the same file can never be hit again
+        self.invalidate(file_path, namespace)
+
+        data = load(file_path)
+        self.put(key, data)
+
+        return data
+
+    def put(self, key: CacheKey, data: object):
+        size = estimate_size(data)
+
+        if size > self.max_bytes:
+            return
+
+        self.entries[key] = (data, size)
+        self.total_bytes += size
+
+        # Evict least recently used inputs
+        while self.total_bytes > self.max_bytes:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.total_bytes -= evicted_size
+
+    def invalidate(self, file_path: str | None = None, namespace: str | None = None):
+        path = None if file_path is None else os.path.abspath(file_path)
+
+        for key in [*self.entries.keys()]:
+            key_namespace, key_path, _, _ = key
+
+            if (path is None or key_path == path) and (namespace is None or key_namespace == namespace):
+                _, size = self.entries.pop(key)
+                self.total_bytes -= size
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+input_cache = InputCache(max_bytes=int(os.environ.get('ADVENT_CACHE_MB', 512)) * 1024 * 1024)
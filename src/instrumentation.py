@@ -0,0 +1,75 @@
+import linecache
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable
+
+
+@dataclass(slots=True, frozen=True)
+class AllocationSite:
+    location: str
+    size: int
+    count: int
+
+
+@dataclass(slots=True, frozen=True)
+class MemoryUsage:
+    peak_bytes: int
+    retained_bytes: int
+    retained_blocks: int
+    top_sites: list[AllocationSite] = field(default_factory=list)
+
+    @property
+    def peak_mb(self) -> float:
+        return self.peak_bytes / (1024 * 1024)
+
+    def as_dict(self) -> dict:
+        return {
+            'peak_bytes': self.peak_bytes,
+            'retained_bytes': self.retained_bytes,
+            'retained_blocks': self.retained_blocks,
+            'top_sites': [
+                {'location': site.location, 'size': site.size, 'count': site.count}
+                for site in self.top_sites
+            ],
+        }
+
+
+def trace_memory[T](func: Callable[[], T], top: int = 5) -> tuple[T, MemoryUsage]:
+    # Peak is measured relative to the memory that was already traced when the call started
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+
+    before = tracemalloc.take_snapshot()
+    baseline, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+
+    try:
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    # Allocations still alive after the call, e.g. the parsed Data or unbounded caches
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    diff = [
+        stat for stat in after.filter_traces(filters).compare_to(before.filter_traces(filters), 'lineno')
+        if stat.size_diff > 0
+    ]
+
+    return result, MemoryUsage(
+        peak_bytes=peak - baseline,
+        retained_bytes=sum(stat.size_diff for stat in diff),
+        retained_blocks=sum(max(stat.count_diff, 0) for stat in diff),
+        top_sites=[
+            AllocationSite(
+                location=f'{frame.filename}:{frame.lineno} {linecache.getline(frame.filename, frame.lineno).strip()}',
+                size=stat.size_diff,
+                count=stat.count_diff,
+            )
+            for stat in diff[:top]
+            for frame in [stat.traceback[0]]
+        ],
+    )
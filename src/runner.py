@@ -0,0 +1,161 @@
+import argparse
+import json
+import math
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from abstract_advent_day import Answer, enable_profiling
+from days import DAYS_DIR, discover_days, load_day
+
+
+@dataclass(slots=True, frozen=True)
+class Job:
+    day: int
+    puzzle: int
+    file_path: str
+    expected: Answer
+
+    @property
+    def label(self) -> str:
+        return f'day{self.day} puzzle_{self.puzzle} {os.path.relpath(self.file_path, DAYS_DIR)}'
+
+
+@dataclass(slots=True, frozen=True)
+class JobResult:
+    job: Job
+    answer: Answer
+    seconds: float
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.answer == self.job.expected
+
+
+def collect_jobs(days: list[int], examples: bool = True, main: bool = True) -> list[Job]:
+    jobs = []
+
+    for day_number in days:
+        day = load_day(day_number)
+        day_dir = os.path.join(DAYS_DIR, f'day{day_number}')
+
+        for puzzle_number in (1, 2):
+            puzzle = getattr(day, f'puzzle_{puzzle_number}')
+
+            if puzzle.disable:
+                continue
+
+            inputs = []
+            if examples and isinstance(puzzle.example_answer, tuple):
+                inputs += [
+                    (f'input_example_{i}.txt', answer)
+                    for i, answer in enumerate(puzzle.example_answer, start=1)
+                ]
+            elif examples:
+                inputs.append(('input_example.txt', puzzle.example_answer))
+
+            if main:
+                inputs.append(('input.txt', puzzle.answer))
+
+            jobs += [
+                Job(day_number, puzzle_number, os.path.join(day_dir, file_name), expected)
+                for file_name, expected in inputs
+                if os.path.isfile(os.path.join(day_dir, file_name))
+            ]
+
+    return jobs
+
+
+def run_job(job: Job) -> JobResult:
+    start = time.perf_counter()
+
+    try:
+        day = load_day(job.day)
+        answer = getattr(day, f'puzzle_{job.puzzle}')(day.read_cached(job.file_path))
+    except Exception:
+        return JobResult(job, None, time.perf_counter() - start, traceback.format_exc())
+
+    return JobResult(job, answer, time.perf_counter() - start)
+
+
+def order_by_history(jobs: list[Job], history_path: str) -> list[Job]:
+    with open(history_path) as f:
+        history = json.load(f)['results']
+
+    def expected_seconds(job: Job) -> float:
+        if os.path.basename(job.file_path) != 'input.txt':
+            return 0
+
+        day_results = history.get(f'day{job.day}', {})
+        stage = day_results.get(f'puzzle_{job.puzzle}')
+
+        # Jobs without history might be slow, so they are scheduled first
+        if stage is None:
+            return math.inf
+
+        return stage['median'] + day_results.get('read', {}).get('median', 0)
+
+    return sorted(jobs, key=expected_seconds, reverse=True)
+
+
+def run_serial(jobs: list[Job]) -> list[JobResult]:
+    return [run_job(job) for job in jobs]
+
+
+def run_parallel(jobs: list[Job], workers: int | None, history_path: str | None = None) -> list[JobResult]:
+    schedule = order_by_history(jobs, history_path) if history_path else jobs
+
+    # Both puzzles of an input run in the same worker, so they share the parsed input and its stages
+    groups: dict[tuple[int, str], list[Job]] = {}
+    for job in schedule:
+        groups.setdefault((job.day, job.file_path), []).append(job)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_serial, group) for group in groups.values()]
+        results = {result.job: result for future in futures for result in future.result()}
+
+    return [results[job] for job in jobs]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m runner', description='Solve every day and check the answers')
+    parser.add_argument('--days', type=int, nargs='*', help='days to run, all by default')
+    parser.add_argument('--parallel', type=int, nargs='?', const=0, help='run jobs in a process pool of this many workers')
+    parser.add_argument('--history', help='benchmark JSON used to start the slowest jobs first')
+    parser.add_argument('--no-examples', action='store_true')
+    parser.add_argument('--no-main', action='store_true')
+    parser.add_argument('--profile', metavar='DIR', help='write a .pstats file per puzzle run to this directory')
+    parser.add_argument('--profile-top', type=int, default=20, help='number of functions to print per profile')
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        enable_profiling(args.profile, args.profile_top)
+
+    jobs = collect_jobs(args.days or discover_days(), examples=not args.no_examples, main=not args.no_main)
+
+    start = time.perf_counter()
+    if args.parallel is None:
+        results = run_serial(jobs)
+    else:
+        results = run_parallel(jobs, args.parallel or None, args.history)
+    elapsed = time.perf_counter() - start
+
+    for result in results:
+        status = 'ok' if result.ok else f'expected {result.job.expected}'
+        print(f'{result.job.label}: {result.answer} {status} ({result.seconds:.3f} s)')
+
+        if result.error:
+            print(result.error, file=sys.stderr)
+
+    failures = sum(not result.ok for result in results)
+    print(f'{len(results) - failures}/{len(results)} correct in {elapsed:.3f} s')
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,108 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+
+from days import discover_days
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+IMPORT_TIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+@dataclass(slots=True, frozen=True)
+class ImportTime:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass(slots=True, frozen=True)
+class StartupReport:
+    day: int
+    total_us: int
+    imports: list[ImportTime]
+
+    @property
+    def total_ms(self) -> float:
+        return self.total_us / 1000
+
+    @property
+    def loads_numpy(self) -> bool:
+        return any(entry.module.split('.')[0] == 'numpy' for entry in self.imports)
+
+    def heaviest(self, top: int) -> list[ImportTime]:
+        return sorted(self.imports, key=lambda entry: entry.self_us, reverse=True)[:top]
+
+    def as_dict(self, top: int) -> dict:
+        return {
+            'total_ms': self.total_ms,
+            'numpy': self.loads_numpy,
+            'heaviest': [{'module': entry.module, 'self_ms': entry.self_us / 1000} for entry in self.heaviest(top)],
+        }
+
+
+def parse_import_times(stderr: str) -> list[ImportTime]:
+    return [
+        ImportTime(module, int(self_us), int(cumulative_us), len(indent) // 2)
+        for self_us, cumulative_us, indent, module in IMPORT_TIME_LINE.findall(stderr)
+    ]
+
+
+def measure_day(day: int) -> StartupReport:
+    # A fresh interpreter per run, the module cache would hide the import cost otherwise
+    module = f'days.day{day}'
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # Interpreter startup imports (site, encodings) come before the day and are left out
+    imports = parse_import_times(process.stderr)
+    start = next(i for i, entry in enumerate(imports) if entry.depth == 0 and entry.module == 'site') + 1
+    imports = imports[start:]
+
+    return StartupReport(day, next(entry.cumulative_us for entry in imports if entry.module == module), imports)
+
+
+def measure_days(days: list[int], repeat: int) -> list[StartupReport]:
+    # The fastest run per day, the others only add disk and scheduling noise
+    return [min((measure_day(day) for _ in range(repeat)), key=lambda report: report.total_us) for day in days]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m startup', description='Measure the import time of every day')
+    parser.add_argument('--days', type=int, nargs='*', help='days to run, all by default')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--top', type=int, default=3, help='number of heaviest modules to show per day')
+    parser.add_argument('--budget', type=float, default=100, help='allowed import time per day in milliseconds')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    args = parser.parse_args(argv)
+
+    reports = measure_days(args.days or discover_days(), args.repeat)
+
+    for report in reports:
+        heaviest = ', '.join(f'{entry.module} {entry.self_us / 1000:.1f}' for entry in report.heaviest(args.top))
+        print(f'day{report.day:<3} {report.total_ms:8.1f} ms  numpy {'yes' if report.loads_numpy else 'no ':<3}  {heaviest}')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({f'day{report.day}': report.as_dict(args.top) for report in reports}, f, indent=2)
+
+    over_budget = [report for report in reports if report.total_ms > args.budget]
+
+    for report in over_budget:
+        print(f'Over budget: day{report.day} {report.total_ms:.1f} ms > {args.budget:.1f} ms', file=sys.stderr)
+
+    return 1 if over_budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from data_reader import *
+
+
+class DataReaderTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, content: str) -> str:
+        file_path = os.path.join(self.directory.name, 'input.txt')
+
+        with open(file_path, 'w', newline='') as f:
+            f.write(content)
+
+        return file_path
+
+    def test_parse_ints(self):
+        values, lines = parse_ints(np.frombuffer(b'12 -3\n\n0 4567 -89\n-1', dtype=np.uint8))
+
+        self.assertEqual([12, -3, 0, 4567, -89, -1], values.tolist())
+        self.assertEqual([0, 0, 2, 2, 2, 3], lines.tolist())
+
+    def test_parse_ints_without_numbers(self):
+        values, lines = parse_ints(np.frombuffer(b'abc\n-\n', dtype=np.uint8))
+
+        self.assertEqual(([], []), (values.tolist(), lines.tolist()))
+
+    def test_read_int_columns(self):
+        expected = [[3, 4], [-4, 3], [2, -5]]
+
+        self.assertEqual(expected, read_int_columns(self.write('3   4\n-4   3\n2   -5\n')).tolist())
+        self.assertEqual(expected, read_int_columns(self.write('3   4\n-4   3\n2   -5')).tolist())
+
+    def test_parse_ints_large_numbers(self):
+        values, _ = parse_ints(np.frombuffer(b'999999999999999999 -123456789012345678', dtype=np.uint8))
+        self.assertEqual([999999999999999999, -123456789012345678], values.tolist())
+
+        with self.assertRaises(ValueError):
+            parse_ints(np.frombuffer(b'1 9999999999999999999', dtype=np.uint8))
+
+    def test_read_int_columns_trailing_blank_lines(self):
+        self.assertEqual([[1, 2], [3, 4]], read_int_columns(self.write('1 2\n3 4\n\n\n')).tolist())
+        self.assertEqual((0, 0), read_int_columns(self.write('')).shape)
+
+    def test_read_int_columns_ragged_rows(self):
+        with self.assertRaises(ValueError):
+            read_int_columns(self.write('1 2\n3\n'))
+
+    def test_read_ragged_ints(self):
+        levels, lengths = read_ragged_ints(self.write('7 6 4\n1 -2\n\n9 7 6 2 1\n\n'), fill=-1)
+
+        self.assertEqual([3, 2, 0, 5], lengths.tolist())
+        self.assertEqual([
+            [7, 6, 4, -1, -1],
+            [1, -2, -1, -1, -1],
+            [-1, -1, -1, -1, -1],
+            [9, 7, 6, 2, 1],
+        ], levels.tolist())
+
+    def test_read_ragged_ints_empty_file(self):
+        levels, lengths = read_ragged_ints(self.write(''))
+
+        self.assertEqual(((0, 0), 0), (levels.shape, lengths.size))
+
+    def test_read_byte_grid(self):
+        for content in ['ab\ncd\nef\n', 'ab\ncd\nef', 'ab\r\ncd\r\nef\r\n']:
+            grid = read_byte_grid(self.write(content))
+
+            self.assertEqual([b'ab', b'cd', b'ef'], [bytes(row) for row in grid])
+
+    def test_byte_grid_trailing_blank_lines(self):
+        for content in ['ab\ncd\n\n', 'ab\ncd\n\n\n', 'ab\r\ncd\r\n\r\n']:
+            grid = str_to_byte_grid(content)
+
+            self.assertEqual((2, 2), grid.shape)
+            self.assertEqual([b'ab', b'cd'], [bytes(row) for row in grid])
+
+    def test_byte_grid_ragged_rows(self):
+        for content in ['ab\nc\n', 'ab\ncde\n', 'abc\nd\ne', 'ab\n\ncd', 'x\ny\nzz']:
+            with self.assertRaises(ValueError):
+                str_to_byte_grid(content)
+
+    def test_empty_byte_grid(self):
+        self.assertEqual((0, 0), read_byte_grid(self.write('')).shape)
+        self.assertEqual((0, 0), str_to_byte_grid('\n\n').shape)
+
+    def test_iter_line_chunks_keeps_lines_whole(self):
+        content = ''.join(f'{i} {-i}\n' for i in range(100)) + '100 -100'
+        file_path = self.write(content)
+
+        for size in [1, 3, 7, 64]:
+            chunks = [bytes(chunk).decode() for chunk in iter_line_chunks(file_path, size)]
+
+            self.assertEqual(content, ''.join(chunks))
+            self.assertTrue(all(chunk.endswith('\n') for chunk in chunks[:-1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+from dataclasses import dataclass
+
+import numpy as np
+
+from disk_cache import DiskCache, load_entry, save_entry
+
+
+@dataclass(slots=True, frozen=True)
+class Data:
+    grid: np.ndarray
+    empty: np.ndarray
+    names: list[str]
+
+
+class DiskCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = DiskCache(self.directory.name)
+        self.entry_dir = os.path.join(self.directory.name, 'entry')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def leftovers(self) -> list[str]:
+        return [name for name in os.listdir(self.directory.name) if name.startswith('.tmp-')]
+
+    def test_dataclass_round_trip(self):
+        data = Data(np.arange(12).reshape(3, 4), np.zeros(0), ['a', 'b'])
+        self.cache.store(self.entry_dir, data)
+        loaded = load_entry(self.entry_dir)
+
+        self.assertIsInstance(loaded, Data)
+        self.assertEqual(data.grid.tolist(), loaded.grid.tolist())
+        self.assertEqual((0,), loaded.empty.shape)
+        self.assertEqual(['a', 'b'], loaded.names)
+
+    def test_arrays_are_read_only_memory_maps(self):
+        self.cache.store(self.entry_dir, Data(np.arange(5), np.zeros(0), []))
+        loaded = load_entry(self.entry_dir)
+
+        self.assertIsInstance(loaded.grid, np.memmap)
+        self.assertFalse(loaded.grid.flags.writeable)
+
+        with self.assertRaises(ValueError):
+            loaded.grid[0] = 1
+
+    def test_plain_object_round_trip(self):
+        self.cache.store(self.entry_dir, {'key': [1, 2, 3]})
+
+        self.assertEqual({'key': [1, 2, 3]}, load_entry(self.entry_dir))
+
+    def test_get_entry_loads_once(self):
+        loads = []
+        load = lambda: loads.append(1) or [1, 2]
+
+        self.assertEqual([1, 2], self.cache.get_entry(self.entry_dir, load))
+        self.assertEqual([1, 2], DiskCache(self.directory.name).get_entry(self.entry_dir, load))
+        self.assertEqual(1, len(loads))
+
+    def test_stage_persists(self):
+        computed = []
+        compute = lambda: computed.append(1) or np.arange(3)
+
+        self.cache.store(self.entry_dir, Data(np.arange(5), np.zeros(0), []))
+        first = self.cache.get_stage(self.entry_dir, 'labels', compute)
+        second = DiskCache(self.directory.name).get_stage(self.entry_dir, 'labels', compute)
+
+        self.assertEqual([0, 1, 2], first.tolist())
+        self.assertEqual([0, 1, 2], second.tolist())
+        self.assertEqual(1, len(computed))
+        self.assertTrue(os.path.isdir(os.path.join(self.entry_dir, 'stages', 'labels')))
+
+    def test_existing_entry_is_kept(self):
+        self.cache.store(self.entry_dir, [1])
+        self.cache.store(self.entry_dir, [2])
+
+        self.assertEqual([1], load_entry(self.entry_dir))
+        self.assertEqual([], self.leftovers())
+
+    def test_failed_store_leaves_nothing_behind(self):
+        with self.assertRaises(Exception):
+            self.cache.store(self.entry_dir, [lambda: None])
+
+        self.assertFalse(os.path.exists(self.entry_dir))
+        self.assertEqual([], self.leftovers())
+
+    def test_save_entry_without_arrays(self):
+        os.makedirs(self.entry_dir)
+        save_entry(self.entry_dir, Data(np.zeros(0), np.zeros(0), ['x']))
+
+        self.assertEqual(['data.pkl'], os.listdir(self.entry_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
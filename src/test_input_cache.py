@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+from dataclasses import dataclass
+
+import numpy as np
+
+from input_cache import InputCache, estimate_size
+from util import CoordSet, Grid
+
+MB = 1 << 20
+
+
+@dataclass(slots=True, frozen=True)
+class Data:
+    grid: np.ndarray
+    column: np.ndarray
+    buffer: memoryview
+
+
+class EstimateSizeTest(unittest.TestCase):
+    def test_view_backed_data_counts_buffers(self):
+        owner = np.zeros((1000, 1000), dtype=np.uint8)
+        raw = bytearray(MB)
+        data = Data(owner[1:-1, 1:-1], owner.T[0], memoryview(raw)[10:])
+
+        self.assertGreaterEqual(estimate_size(data), owner.nbytes + len(raw))
+
+    def test_shared_buffer_counted_once(self):
+        owner = np.zeros(MB, dtype=np.uint8)
+
+        self.assertLess(estimate_size([owner[:10], owner[10:], owner]), 2 * MB)
+
+    def test_slotted_objects(self):
+        grid = Grid(np.zeros((1000, 1000), dtype=np.uint8))
+        coords = CoordSet(MB)
+
+        self.assertGreaterEqual(estimate_size(grid), len(grid.cells))
+        self.assertGreaterEqual(estimate_size(coords), MB)
+
+    def test_memory_mapped_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'input.txt')
+            np.zeros(MB, dtype=np.uint8).tofile(file_path)
+            mapped = np.memmap(file_path, dtype=np.uint8, mode='r')
+
+            self.assertGreaterEqual(estimate_size(mapped[::2]), MB)
+            del mapped
+
+
+class InputCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_paths = []
+
+        for i in range(3):
+            self.file_paths.append(os.path.join(self.directory.name, f'input{i}.txt'))
+
+            with open(self.file_paths[-1], 'w') as f:
+                f.write(str(i))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_cap_evicts_least_recently_used(self):
+        cache = InputCache(max_bytes=int(2.5 * MB))
+        load = lambda file_path: Data(np.zeros((MB, 2), dtype=np.uint8)[:, 0], np.zeros(0), memoryview(b''))
+
+        for file_path in self.file_paths:
+            cache.get('test', file_path, load)
+
+        self.assertEqual(1, len(cache))
+        self.assertLessEqual(cache.total_bytes, cache.max_bytes)
+
+        cache.get('test', self.file_paths[0], load)
+        self.assertEqual((0, 4), (cache.hits, cache.misses))
+
+        cache.get('test', self.file_paths[0], load)
+        self.assertEqual((1, 4), (cache.hits, cache.misses))
+
+    def test_too_large_input_is_not_cached(self):
+        cache = InputCache(max_bytes=MB)
+        cache.get('test', self.file_paths[0], lambda file_path: np.zeros(2 * MB, dtype=np.uint8)[1:])
+
+        self.assertEqual(0, len(cache))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from days import load_day
+from days.day3 import run_instructions
+
+
+class Day1StreamTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.day = load_day(1)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_small_chunks_and_blocks_merge_many_runs(self):
+        # Few distinct values, so equal values span runs and blocks
+        pairs = np.random.default_rng(0).integers(0, 50, size=(1000, 2))
+        file_path = os.path.join(self.directory.name, 'input.txt')
+
+        with open(file_path, 'w') as f:
+            f.write('\n'.join(f'{a}   {b}' for a, b in pairs))
+
+        data = self.day.read(file_path)
+        expected = (self.day.puzzle_1(data), self.day.puzzle_2(data))
+
+        for chunk_size, block_size in [(1, 1), (64, 3), (1000, 7), (1 << 20, 1 << 16)]:
+            self.assertEqual(expected, self.day.solve_stream(file_path, chunk_size, block_size))
+
+    def test_empty_input(self):
+        file_path = os.path.join(self.directory.name, 'input.txt')
+        open(file_path, 'w').close()
+
+        self.assertEqual((0, 0), self.day.solve_stream(file_path, 16, 4))
+
+
+class Day3StreamTest(unittest.TestCase):
+    EXAMPLES = {
+        'xmul(2,4)%&mul[3,7]!@^do_not_mul(5,5)+mul(32,64]then(mul(11,8)mul(8,5))': (161, 161),
+        "xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64](mul(11,8)undo()?mul(8,5))": (161, 48),
+    }
+
+    def test_instructions_cut_at_every_chunk_size(self):
+        for memory, expected in self.EXAMPLES.items():
+            for size in range(1, 14):
+                chunks = [memory[start:start + size] for start in range(0, len(memory), size)]
+
+                self.assertEqual(expected, run_instructions(chunks), f'chunk size {size}')
+
+
+if __name__ == '__main__':
+    unittest.main()
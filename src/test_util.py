@@ -0,0 +1,386 @@
+import pickle
+import unittest
+
+import numpy as np
+
+from data_reader import str_to_byte_grid
+from util import *
+
+
+class GridTest(unittest.TestCase):
+    def setUp(self):
+        self.grid = Grid(str_to_byte_grid('ab.\n.#c'), sentinel=ord('~'))
+
+    def test_padding(self):
+        self.assertEqual((2, 3, 5), (self.grid.height, self.grid.width, self.grid.stride))
+        self.assertEqual(4 * 5, self.grid.size)
+        self.assertEqual(b'~~~~~~ab.~~.#c~~~~~~', bytes(self.grid.cells))
+
+    def test_wider_padding(self):
+        grid = Grid(str_to_byte_grid('ab\ncd'), sentinel=0, padding=2)
+
+        self.assertEqual(6, grid.stride)
+        self.assertEqual(ord('a'), grid.cells[grid.index(0, 0)])
+        self.assertEqual([b'ab', b'cd'], [bytes(row) for row in grid.view()])
+
+    def test_index_and_coord(self):
+        for y in range(self.grid.height):
+            for x in range(self.grid.width):
+                index = self.grid.index(y, x)
+
+                self.assertEqual((y, x), self.grid.coord(index))
+                self.assertEqual(index, self.grid.indices()[y * self.grid.width + x])
+
+    def test_neighbours_outside_are_sentinel(self):
+        # Every step off the grid, in any of the 8 directions, lands on the border
+        for index in self.grid.indices():
+            for offset in self.grid.offsets8:
+                y, x = self.grid.coord(index + offset)
+
+                if not in_2d_grid(self.grid.view(), y, x):
+                    self.assertEqual(ord('~'), self.grid.cells[index + offset])
+
+    def test_offsets(self):
+        start = self.grid.index(0, 1)
+
+        self.assertEqual(self.grid.index(1, 1), start + self.grid.offsets[Direction.S])
+        self.assertEqual(self.grid.index(0, 2), start + self.grid.offsets[Direction.E])
+        self.assertEqual(self.grid.index(1, 0), start + self.grid.offsets8[Direction8.SW])
+
+    def test_find(self):
+        self.assertEqual(self.grid.index(1, 1), self.grid.find(ord('#')))
+        self.assertEqual([self.grid.index(0, 2), self.grid.index(1, 0)], self.grid.find_all(ord('.')).tolist())
+
+    def test_array_shares_cells(self):
+        self.grid.cells[self.grid.index(0, 0)] = ord('z')
+
+        self.assertEqual(ord('z'), self.grid.view()[0, 0])
+
+    def test_copy_is_independent(self):
+        copy = self.grid.copy()
+        copy.cells[copy.index(0, 0)] = ord('z')
+
+        self.assertEqual(ord('a'), self.grid.cells[self.grid.index(0, 0)])
+        self.assertEqual(bytes(self.grid.cells[:5]), bytes(copy.cells[:5]))
+
+    def test_pickle_round_trip(self):
+        grid = pickle.loads(pickle.dumps(self.grid))
+
+        self.assertEqual(bytes(self.grid.cells), bytes(grid.cells))
+        self.assertEqual((self.grid.offsets, self.grid.offsets8), (grid.offsets, grid.offsets8))
+
+        # The array has to be a view on the unpickled cells, not a separate copy
+        grid.cells[grid.index(1, 2)] = ord('z')
+        self.assertEqual(ord('z'), grid.view()[1, 2])
+
+
+class DirectionTest(unittest.TestCase):
+    def test_turns(self):
+        self.assertEqual(Direction.E, Direction.N.right())
+        self.assertEqual(Direction.W, Direction.N.left())
+        self.assertEqual(Direction.S, Direction.N.opposite())
+        self.assertEqual(Direction.N, Direction.W.right())
+
+
+class CoordSetTest(unittest.TestCase):
+    def test_add_and_discard(self):
+        coords = CoordSet(10, [1, 3])
+        coords.add(5)
+        coords.add(3)
+        coords.add_many(np.array([7, 8]))
+        coords.discard(1)
+        coords.discard(2)
+
+        self.assertEqual([3, 5, 7, 8], [*coords])
+        self.assertEqual(4, len(coords))
+        self.assertIn(5, coords)
+        self.assertNotIn(1, coords)
+
+    def test_set_operations(self):
+        a, b = CoordSet(6, [0, 1, 2]), CoordSet(6, [2, 3])
+
+        self.assertEqual([0, 1, 2, 3], (a | b).indices().tolist())
+        self.assertEqual([2], a.intersection(b).indices().tolist())
+
+        a &= b
+        self.assertEqual([2], a.indices().tolist())
+        a |= CoordSet(6, [5])
+        self.assertEqual([2, 5], a.indices().tolist())
+
+    def test_from_mask(self):
+        coords = CoordSet.from_mask(np.array([[True, False], [False, True]]))
+
+        self.assertEqual([0, 3], coords.indices().tolist())
+
+    def test_clear(self):
+        coords = CoordSet(6, [1, 2, 4])
+        coords.clear([1, 4])
+        self.assertEqual([2], [*coords])
+
+        coords.clear()
+        self.assertEqual(0, len(coords))
+
+    def test_array_shares_flags(self):
+        coords = CoordSet(4)
+        coords.array[2] = True
+
+        self.assertIn(2, coords)
+
+    def test_pickle_round_trip(self):
+        coords = pickle.loads(pickle.dumps(CoordSet(100, [4, 50, 99])))
+        coords.add(7)
+
+        self.assertEqual([4, 7, 50, 99], coords.indices().tolist())
+        self.assertEqual(100, len(coords.flags))
+
+
+class WordIndexTest(unittest.TestCase):
+    GRID = str_to_byte_grid('\n'.join([
+        'XMASAMX',
+        'MMAXSAM',
+        'AAXMASA',
+        'SAMXMAS',
+        'ABABAXS',
+    ]))
+
+    def test_count_matches_count_word(self):
+        words = [b'XMAS', b'SAMX', b'AMX', b'MA', b'ABA', b'AXA', b'ASA', b'X', b'XMASAMX', b'SAMXMAS', b'QQ']
+        counts = WordIndex(self.GRID).count(words)
+
+        self.assertEqual([count_word(self.GRID, word) for word in words], counts)
+        self.assertEqual(0, counts[-1])
+
+    def test_single_direction_counts(self):
+        grid = str_to_byte_grid('ABC\nDEF')
+
+        self.assertEqual([1, 1, 1, 1, 0], WordIndex(grid).count([b'ABC', b'FED', b'AD', b'AE', b'AF']))
+
+    def test_palindromes_count_every_direction(self):
+        grid = str_to_byte_grid('ABA\n...\n...')
+
+        self.assertEqual([2, 8, 4], WordIndex(grid).count([b'ABA', b'B', b'...']))
+        self.assertEqual(2, count_word(grid, b'ABA'))
+        self.assertEqual(8, count_word(grid, b'B'))
+
+    def test_index_is_reused(self):
+        index = WordIndex(self.GRID)
+        index.count([b'XMAS'])
+        table = index.table(4)
+
+        self.assertEqual(index.count([b'SAMX', b'XMAS']), [count_word(self.GRID, b'SAMX'), count_word(self.GRID, b'XMAS')])
+        self.assertIs(table, index.table(4))
+
+    def test_word_longer_than_grid(self):
+        self.assertEqual([0], WordIndex(str_to_byte_grid('AB\nCD')).count([b'ABC']))
+
+    def test_word_length_is_validated(self):
+        index = WordIndex(self.GRID)
+
+        for word in [b'', b'XMASXMASX']:
+            with self.assertRaises(ValueError):
+                index.count([b'XMAS', word])
+
+
+class UnionFindTest(unittest.TestCase):
+    def test_union(self):
+        uf = UnionFind(6, weights=[1, 2, 3, 4, 5, 6])
+
+        self.assertTrue(uf.union(0, 1))
+        self.assertTrue(uf.union(2, 1))
+        self.assertFalse(uf.union(0, 2))
+        self.assertTrue(uf.union(3, 4))
+
+        self.assertEqual(3, uf.components)
+        self.assertTrue(uf.connected(0, 2))
+        self.assertFalse(uf.connected(0, 3))
+        self.assertEqual((3, 6), (uf.size(2), uf.total(2)))
+        self.assertEqual((2, 9), (uf.size(4), uf.total(4)))
+        self.assertEqual((1, 6), (uf.size(5), uf.total(5)))
+        self.assertEqual(3, len(uf.roots()))
+
+    def test_union_by_size(self):
+        uf = UnionFind(5)
+        uf.union_many(np.array([1, 2, 3]), np.array([2, 3, 4]))
+        root = uf.find(1)
+
+        # The single node is attached below the root of the larger tree, whichever side it is on
+        uf.union(0, 1)
+
+        self.assertEqual(root, uf.find(0))
+        self.assertEqual(root, uf.parent[0])
+        self.assertEqual(5, uf.size(0))
+
+    def test_path_halving(self):
+        uf = UnionFind(5)
+        uf.parent = [0, 0, 1, 2, 3]
+
+        self.assertEqual(0, uf.find(4))
+        self.assertEqual([0, 0, 0, 2, 2], uf.parent)
+
+        self.assertEqual(0, uf.find(4))
+        self.assertEqual([0, 0, 0, 2, 0], uf.parent)
+
+    def test_labels(self):
+        uf = UnionFind(6)
+        uf.parent = [0, 0, 1, 2, 4, 3]
+
+        self.assertEqual([0, 0, 0, 0, 4, 0], uf.labels().tolist())
+        self.assertEqual([uf.find(node) for node in range(6)], uf.labels().tolist())
+
+
+class SearchTest(unittest.TestCase):
+    # 0 - 1 - 2 - 3, and 0 - 4 - 3 with fewer steps but a higher weight, node 5 is unreachable
+    EDGES = {0: [(1, 1), (4, 5)], 1: [(2, 1)], 2: [(3, 1)], 3: [], 4: [(3, 0)], 5: [(0, 1)]}
+
+    def test_bfs(self):
+        result = bfs(6, [0], lambda node: [neighbour for neighbour, _ in self.EDGES[node]])
+
+        self.assertEqual([0, 1, 2, 2, 1, UNREACHED], result.distance.tolist())
+        self.assertEqual([0, 4, 3], result.path(3))
+        self.assertFalse(result.reached(5))
+        self.assertEqual([], result.path(5))
+
+    def test_bfs_stops_at_target(self):
+        result = bfs(6, [0], lambda node: [neighbour for neighbour, _ in self.EDGES[node]], target=1)
+
+        self.assertLess(result.expanded, 4)
+        self.assertEqual([0, 1], result.path(1))
+
+    def test_bucket_dijkstra(self):
+        result = bucket_dijkstra(6, [0], lambda node: self.EDGES[node], max_weight=5)
+
+        self.assertEqual([0, 1, 2, 3, 5, UNREACHED], result.distance.tolist())
+        self.assertEqual([0, 1, 2, 3], result.path(3))
+
+    def test_bucket_dijkstra_multiple_sources(self):
+        result = bucket_dijkstra(6, [0, 4], lambda node: self.EDGES[node], max_weight=5)
+
+        self.assertEqual([0, 1, 2, 0, 0, UNREACHED], result.distance.tolist())
+        self.assertEqual([4, 3], result.path(3))
+
+    def test_zero_one_bfs(self):
+        # Same graph with the weight of 0 - 4 lowered to 1, so the longer path is cheaper
+        edges = lambda node: [(neighbour, min(weight, 1)) for neighbour, weight in self.EDGES[node]]
+        result = zero_one_bfs(6, [0], edges)
+
+        self.assertEqual([0, 1, 2, 1, 1, UNREACHED], result.distance.tolist())
+        self.assertEqual([0, 4, 3], result.path(3))
+
+    def test_dijkstra(self):
+        result = dijkstra(6, [0], lambda node: self.EDGES[node])
+
+        self.assertEqual([0, 1, 2, 3, 5, UNREACHED], result.distance.tolist())
+        self.assertEqual([0, 1, 2, 3], result.path(3))
+
+    def test_a_star_expands_less(self):
+        # Nodes on a line, every node links to its neighbours, the heuristic is the distance to the target
+        size, target = 100, 60
+        edges = lambda node: [(neighbour, 1) for neighbour in (node - 1, node + 1) if 0 <= neighbour < size]
+        plain = dijkstra(size, [50], edges, target=target)
+        guided = dijkstra(size, [50], edges, target=target, heuristic=lambda node: abs(target - node))
+
+        self.assertEqual(10, guided.distance[target])
+        self.assertEqual(plain.path(target), guided.path(target))
+        self.assertLess(guided.expanded, plain.expanded)
+
+
+class MemoTest(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.memos = []
+
+    def tearDown(self):
+        for memoized in self.memos:
+            MEMOS.remove(memoized.cache)
+
+    def memoized(self, **options) -> Callable:
+        @memo(**options)
+        def square(n: int, *ignored) -> int:
+            self.calls.append(n)
+            return n * n
+
+        self.memos.append(square)
+        return square
+
+    def test_process_scope_survives_inputs(self):
+        square = self.memoized()
+        enter_memo_scope('input 1')
+        square(2)
+        enter_memo_scope('input 2')
+        square(2)
+
+        self.assertEqual([2], self.calls)
+        self.assertEqual({'hits': 1, 'misses': 1, 'evictions': 0, 'size': 1, 'bytes': 0}, square.cache.stats())
+
+    def test_input_scope_is_cleared_on_a_new_input(self):
+        square = self.memoized(scope='input', key=lambda n, *ignored: n)
+        first, second = ['input 1'], ['input 1']
+
+        enter_memo_scope(first)
+        square(2, 'a')
+        enter_memo_scope(first)
+        square(2, 'b')
+        self.assertEqual([2], self.calls)
+
+        # An equal but different input object is a new input
+        enter_memo_scope(second)
+        square(2, 'c')
+        self.assertEqual([2, 2], self.calls)
+
+    def test_call_scope_is_cleared_on_every_call(self):
+        square = self.memoized(scope='call', key=lambda n, *ignored: n)
+        data = object()
+
+        for _ in range(2):
+            enter_memo_scope(data)
+            square(3)
+            square(3)
+
+        self.assertEqual([3, 3], self.calls)
+
+    def test_clear_keeps_counters(self):
+        for square in [self.memoized(scope='input'), self.memoized(scope='input', key=lambda n, *ignored: n)]:
+            square(1)
+            square(1)
+            clear_memos(['input'])
+            self.assertEqual((1, 1, 0), (square.cache.stats()['hits'], square.cache.stats()['misses'], square.cache.stats()['size']))
+
+            clear_memos(['input'], counters=True)
+            self.assertEqual((0, 0), (square.cache.stats()['hits'], square.cache.stats()['misses']))
+
+    def test_max_size_evicts_least_recently_used(self):
+        for square in [self.memoized(max_size=2), self.memoized(max_size=2, key=lambda n, *ignored: n)]:
+            self.calls.clear()
+
+            for n in [1, 2, 1, 3, 1, 2]:
+                square(n)
+
+            self.assertEqual([1, 2, 3, 2], self.calls)
+            self.assertEqual((2, 2), (square.cache.stats()['evictions'], square.cache.stats()['size']))
+
+    def test_max_bytes(self):
+        @memo(max_bytes=3 << 20)
+        def zeros(n: int) -> np.ndarray:
+            return np.zeros(n << 20, dtype=np.uint8)
+
+        self.memos.append(zeros)
+
+        for n in [1, 1, 2, 1]:
+            zeros(n)
+
+        self.assertEqual({'hits': 1, 'misses': 3, 'evictions': 2, 'size': 1}, {k: v for k, v in zeros.cache.stats().items() if k != 'bytes'})
+        self.assertLessEqual(zeros.cache.stats()['bytes'], 3 << 20)
+
+    def test_recursion(self):
+        @memo()
+        def fibonacci(n: int) -> int:
+            return n if n < 2 else fibonacci(n - 1) + fibonacci(n - 2)
+
+        self.memos.append(fibonacci)
+
+        self.assertEqual(354224848179261915075, fibonacci(100))
+        self.assertEqual(101, fibonacci.cache.stats()['misses'])
+
+
+if __name__ == '__main__':
+    unittest.main()
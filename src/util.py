@@ -1,7 +1,16 @@
+from __future__ import annotations
+
+import functools
+import heapq
+from collections import OrderedDict, deque
 from dataclasses import dataclass
-from typing import Iterable, Any
+from enum import IntEnum
+from typing import Callable, Iterable, Any, Literal
+
+from input_cache import estimate_size
+from lazy_import import lazy_import
 
-import numpy as np
+np = lazy_import('numpy')
 
 
 def implode(a: Iterable, sep: str = '') -> str:
@@ -25,19 +34,669 @@ class MooreNeighbourhood:
     SE: Any
 
 
-def moore_neighbourhood(m: np.ndarray, i: int, j: int) -> MooreNeighbourhood:
+def moore_stencil(m: np.ndarray, fill: Any = 0) -> MooreNeighbourhood:
+    # Every field is a view of the grid's shape, holding that neighbour of each cell, or fill outside the grid
+    padded = np.pad(m, 1, constant_values=fill)
+
     return MooreNeighbourhood(
-        NW=m[i - 1, j - 1] if i > 0 and j > 0 else None,
-        N=m[i - 1, j] if i > 0 else None,
-        NE=m[i - 1, j + 1] if i > 0 and j < m.shape[1] - 1 else None,
-        W=m[i, j - 1] if j > 0 else None,
-        C=m[i, j] if j < m.shape[1] - 1 else None,
-        E=m[i, j + 1] if j < m.shape[1] - 1 else None,
-        SW=m[i + 1, j - 1] if i < m.shape[0] - 1 and j > 0 else None,
-        S=m[i + 1, j] if i < m.shape[0] - 1 else None,
-        SE=m[i + 1, j + 1] if i < m.shape[0] - 1 and j < m.shape[1] - 1 else None,
+        NW=padded[:-2, :-2],
+        N=padded[:-2, 1:-1],
+        NE=padded[:-2, 2:],
+        W=padded[1:-1, :-2],
+        C=padded[1:-1, 1:-1],
+        E=padded[1:-1, 2:],
+        SW=padded[2:, :-2],
+        S=padded[2:, 1:-1],
+        SE=padded[2:, 2:],
+    )
+
+
+def match_pattern(m: np.ndarray, pattern: np.ndarray, wildcard: Any = None) -> np.ndarray:
+    # Mask of the positions where the pattern matches with its top left corner, wildcard cells match anything
+    height, width = m.shape[0] - pattern.shape[0] + 1, m.shape[1] - pattern.shape[1] + 1
+
+    if height <= 0 or width <= 0:
+        return np.zeros((max(height, 0), max(width, 0)), dtype=bool)
+
+    matches = np.ones((height, width), dtype=bool)
+
+    for (dy, dx), value in np.ndenumerate(pattern):
+        if value != wildcard:
+            matches &= m[dy:dy + height, dx:dx + width] == value
+
+    return matches
+
+
+def word_pattern(word: bytes, direction: Direction8, wildcard: int = 0) -> np.ndarray:
+    # The word written in the given direction on a pattern of wildcards, for use with match_pattern
+    ys, xs = np.arange(len(word)) * direction.dy, np.arange(len(word)) * direction.dx
+    pattern = np.full((np.ptp(ys) + 1, np.ptp(xs) + 1), wildcard, dtype=np.uint8)
+    pattern[ys - ys.min(), xs - xs.min()] = np.frombuffer(word, dtype=np.uint8)
+
+    return pattern
+
+
+def count_word(m: np.ndarray, word: bytes, wildcard: int = 0) -> int:
+    # Occurrences in all 8 directions, the wildcard must not appear in the grid
+    return sum(
+        int(np.count_nonzero(match_pattern(m, word_pattern(word, direction, wildcard), wildcard)))
+        for direction in Direction8
     )
 
 
+class WordIndex:
+    # Every n-gram of the grid in all 8 directions, packed into one integer per start cell and direction.
+    # A table per word length is built on first use, after that any number of words is a sorted lookup.
+    # Words of mixed lengths cost one table each, at most MAX_LENGTH of them since longer words don't fit the packing.
+    # Counts match count_word, every direction is an occurrence of its own, so palindromes are found twice.
+    __slots__ = ['grid', 'tables']
+
+    MAX_LENGTH = 8
+
+    def __init__(self, m: np.ndarray):
+        self.grid = m
+        self.tables = {}
+
+    def table(self, length: int) -> tuple[np.ndarray, np.ndarray]:
+        if length not in self.tables:
+            codes = [self.direction_codes(length, direction) for direction in Direction8]
+            self.tables[length] = np.unique(np.concatenate(codes), return_counts=True)
+
+        return self.tables[length]
+
+    def direction_codes(self, length: int, direction: Direction8) -> np.ndarray:
+        ys, xs = np.arange(length) * direction.dy, np.arange(length) * direction.dx
+        ys, xs = ys - ys.min(), xs - xs.min()
+        height, width = self.grid.shape[0] - ys.max(), self.grid.shape[1] - xs.max()
+
+        if height <= 0 or width <= 0:
+            return np.zeros(0, dtype=np.uint64)
+
+        codes = np.zeros((height, width), dtype=np.uint64)
+
+        for y, x in zip(ys, xs):
+            codes = codes << np.uint64(8) | self.grid[y:y + height, x:x + width]
+
+        return codes.ravel()
+
+    def count(self, words: list[bytes]) -> list[int]:
+        for word in words:
+            if not 1 <= len(word) <= self.MAX_LENGTH:
+                raise ValueError(f'Words need 1 to {self.MAX_LENGTH} letters to be indexed, got {word!r}')
+
+        counts = [0] * len(words)
+        by_length = {}
+
+        for i, word in enumerate(words):
+            by_length.setdefault(len(word), []).append(i)
+
+        for length, indices in by_length.items():
+            keys, key_counts = self.table(length)
+            codes = np.array([int.from_bytes(words[i]) for i in indices], dtype=np.uint64)
+            found = np.searchsorted(keys, codes)
+
+            for i, pos, code in zip(indices, found.tolist(), codes.tolist()):
+                counts[i] = int(key_counts[pos]) if pos < len(keys) and keys[pos] == code else 0
+
+        return counts
+
+
 def in_2d_grid(m: np.ndarray, y: int, x: int) -> bool:
     return 0 <= y < m.shape[0] and 0 <= x < m.shape[1]
+
+
+class Direction(IntEnum):
+    N = 0
+    E = 1
+    S = 2
+    W = 3
+
+    @property
+    def dy(self) -> int:
+        return (-1, 0, 1, 0)[self]
+
+    @property
+    def dx(self) -> int:
+        return (0, 1, 0, -1)[self]
+
+    def right(self) -> 'Direction':
+        return Direction((self + 1) % 4)
+
+    def left(self) -> 'Direction':
+        return Direction((self + 3) % 4)
+
+    def opposite(self) -> 'Direction':
+        return Direction((self + 2) % 4)
+
+
+class Direction8(IntEnum):
+    N = 0
+    NE = 1
+    E = 2
+    SE = 3
+    S = 4
+    SW = 5
+    W = 6
+    NW = 7
+
+    @property
+    def dy(self) -> int:
+        return (-1, -1, 0, 1, 1, 1, 0, -1)[self]
+
+    @property
+    def dx(self) -> int:
+        return (0, 1, 1, 1, 0, -1, -1, -1)[self]
+
+
+class Grid:
+    # Cells are stored row by row in a flat uint8 buffer, surrounded by a border of sentinel cells.
+    # A cell is addressed by its flat index, so a neighbour is index + offset and never out of bounds.
+    __slots__ = ['cells', 'array', 'height', 'width', 'padding', 'stride', 'offsets', 'offsets8']
+
+    def __init__(self, cells: np.ndarray, sentinel: int = 0, padding: int = 1):
+        self.height, self.width = cells.shape
+        self.padding = padding
+        self.stride = self.width + 2 * padding
+
+        padded = np.full((self.height + 2 * padding, self.stride), sentinel, dtype=np.uint8)
+        padded[padding:padding + self.height, padding:padding + self.width] = cells
+
+        # The bytearray gives fast scalar access in loops, the array is a view on the same memory
+        self.cells = bytearray(padded.tobytes())
+        self.array = np.frombuffer(self.cells, dtype=np.uint8)
+
+        self.offsets = tuple(d.dy * self.stride + d.dx for d in Direction)
+        self.offsets8 = tuple(d.dy * self.stride + d.dx for d in Direction8)
+
+    @classmethod
+    def filled(cls, height: int, width: int, value: int, sentinel: int = 0, padding: int = 1) -> 'Grid':
+        return cls(np.full((height, width), value, dtype=np.uint8), sentinel, padding)
+
+    @property
+    def size(self) -> int:
+        return len(self.cells)
+
+    def index(self, y: int, x: int) -> int:
+        return (y + self.padding) * self.stride + x + self.padding
+
+    def coord(self, index: int) -> tuple[int, int]:
+        y, x = divmod(index, self.stride)
+        return y - self.padding, x - self.padding
+
+    def view(self) -> np.ndarray:
+        p = self.padding
+        return self.array.reshape(-1, self.stride)[p:p + self.height, p:p + self.width]
+
+    def indices(self) -> np.ndarray:
+        p = self.padding
+        return ((np.arange(self.height)[:, None] + p) * self.stride + np.arange(self.width) + p).ravel()
+
+    def find(self, value: int) -> int:
+        return self.cells.index(value)
+
+    def find_all(self, value: int) -> np.ndarray:
+        return np.flatnonzero(self.array == value)
+
+    def copy(self) -> 'Grid':
+        return Grid(self.view(), self.cells[0], self.padding)
+
+    def __reduce__(self):
+        # Pickled from the cells only, the array has to be a view on the unpickled bytearray again
+        return Grid, (self.view().copy(), self.cells[0], self.padding)
+
+
+
+class CoordSet:
+    # Set of flat indices in 0..size, one byte per index, with a bool NumPy view on the same memory
+    __slots__ = ['flags', 'array']
+
+    def __init__(self, size: int, indices: Iterable[int] | np.ndarray = ()):
+        self.flags = bytearray(size)
+        self.array = np.frombuffer(self.flags, dtype=bool)
+        self.add_many(indices)
+
+    def add(self, index: int):
+        self.flags[index] = 1
+
+    def add_many(self, indices: Iterable[int] | np.ndarray):
+        self.array[np.asarray(indices, dtype=np.int64)] = True
+
+    def discard(self, index: int):
+        self.flags[index] = 0
+
+    def __contains__(self, index: int) -> bool:
+        return self.flags[index] == 1
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.array))
+
+    def __iter__(self):
+        return iter(self.indices().tolist())
+
+    def __or__(self, other: 'CoordSet') -> 'CoordSet':
+        return CoordSet.from_mask(self.array | other.array)
+
+    def __and__(self, other: 'CoordSet') -> 'CoordSet':
+        return CoordSet.from_mask(self.array & other.array)
+
+    union = __or__
+    intersection = __and__
+
+    def __ior__(self, other: 'CoordSet') -> 'CoordSet':
+        self.array |= other.array
+        return self
+
+    def __iand__(self, other: 'CoordSet') -> 'CoordSet':
+        self.array &= other.array
+        return self
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray) -> 'CoordSet':
+        coord_set = cls(mask.size)
+        coord_set.array[:] = mask.ravel()
+        return coord_set
+
+    def indices(self) -> np.ndarray:
+        return np.flatnonzero(self.array)
+
+    def __reduce__(self):
+        return CoordSet, (len(self.flags), self.indices())
+
+    def clear(self, indices: Iterable[int] | np.ndarray | None = None):
+        # Resetting only the added indices is cheaper when the set is reused for a few entries at a time
+        if indices is None:
+            self.array.fill(False)
+        else:
+            self.array[np.asarray(indices, dtype=np.int64)] = False
+
+
+class UnionFind:
+    # Disjoint sets over the nodes 0..size, every root keeps the size and the summed weights of its component
+    __slots__ = ['parent', 'sizes', 'totals', 'components']
+
+    def __init__(self, size: int, weights: Iterable[int] | None = None):
+        self.parent = list(range(size))
+        self.sizes = [1] * size
+        self.totals = [*weights] if weights is not None else [0] * size
+        self.components = size
+
+    def find(self, node: int) -> int:
+        parent = self.parent
+
+        # Path halving, every other node on the way is pointed to its grandparent
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+
+        return node
+
+    def union(self, a: int, b: int) -> bool:
+        a, b = self.find(a), self.find(b)
+
+        if a == b:
+            return False
+
+        # Union by size, the smaller tree is attached to the larger one
+        if self.sizes[a] < self.sizes[b]:
+            a, b = b, a
+
+        self.parent[b] = a
+        self.sizes[a] += self.sizes[b]
+        self.totals[a] += self.totals[b]
+        self.components -= 1
+
+        return True
+
+    def union_many(self, a: np.ndarray, b: np.ndarray):
+        for node_a, node_b in zip(a.tolist(), b.tolist()):
+            self.union(node_a, node_b)
+
+    def connected(self, a: int, b: int) -> bool:
+        return self.find(a) == self.find(b)
+
+    def size(self, node: int) -> int:
+        return self.sizes[self.find(node)]
+
+    def total(self, node: int) -> int:
+        return self.totals[self.find(node)]
+
+    def roots(self) -> list[int]:
+        return [node for node, parent in enumerate(self.parent) if node == parent]
+
+    def labels(self) -> np.ndarray:
+        # Root of every node, by pointer jumping on all nodes at once
+        labels = np.array(self.parent)
+
+        while not np.array_equal(grandparents := labels[labels], labels):
+            labels = grandparents
+
+        return labels
+
+
+# Searches run on flat node ids in 0..size, e.g. Grid indices or index * 4 + Direction.
+# Neighbours are produced by a callback, edges carry a weight as (node, weight).
+UNREACHED = -1
+
+type Neighbours = Callable[[int], Iterable[int]]
+type Edges = Callable[[int], Iterable[tuple[int, int]]]
+
+
+@dataclass(slots=True, frozen=True)
+class SearchResult:
+    distance: np.ndarray
+    predecessor: np.ndarray
+    expanded: int
+
+    def reached(self, node: int) -> bool:
+        return self.distance[node] != UNREACHED
+
+    def path(self, node: int) -> list[int]:
+        if not self.reached(node):
+            return []
+
+        path = [node]
+        while self.predecessor[path[-1]] != UNREACHED:
+            path.append(int(self.predecessor[path[-1]]))
+
+        return path[::-1]
+
+
+def search_result(distance: list[int], predecessor: list[int], expanded: int) -> SearchResult:
+    # Lists are faster to update one node at a time, the result is converted once for vectorized use
+    return SearchResult(np.array(distance, dtype=np.int64), np.array(predecessor, dtype=np.int64), expanded)
+
+
+def bfs(size: int, sources: Iterable[int], neighbours: Neighbours, target: int | None = None) -> SearchResult:
+    distance = [UNREACHED] * size
+    predecessor = [UNREACHED] * size
+    queue = deque()
+    expanded = 0
+
+    for source in sources:
+        distance[source] = 0
+        queue.append(source)
+
+    while queue:
+        node = queue.popleft()
+        expanded += 1
+
+        if node == target:
+            break
+
+        for neighbour in neighbours(node):
+            if distance[neighbour] == UNREACHED:
+                distance[neighbour] = distance[node] + 1
+                predecessor[neighbour] = node
+                queue.append(neighbour)
+
+    return search_result(distance, predecessor, expanded)
+
+
+def zero_one_bfs(size: int, sources: Iterable[int], edges: Edges, target: int | None = None) -> SearchResult:
+    # Weights are 0 or 1, zero weight edges go to the front of the queue
+    distance = [UNREACHED] * size
+    predecessor = [UNREACHED] * size
+    settled = [False] * size
+    queue = deque()
+    expanded = 0
+
+    for source in sources:
+        distance[source] = 0
+        queue.append(source)
+
+    while queue:
+        node = queue.popleft()
+
+        if settled[node]:
+            continue
+
+        settled[node] = True
+        expanded += 1
+
+        if node == target:
+            break
+
+        for neighbour, weight in edges(node):
+            new_distance = distance[node] + weight
+
+            if distance[neighbour] == UNREACHED or new_distance < distance[neighbour]:
+                distance[neighbour] = new_distance
+                predecessor[neighbour] = node
+                queue.appendleft(neighbour) if weight == 0 else queue.append(neighbour)
+
+    return search_result(distance, predecessor, expanded)
+
+
+def dijkstra(
+        size: int,
+        sources: Iterable[int],
+        edges: Edges,
+        target: int | None = None,
+        heuristic: Callable[[int], int] | None = None,
+) -> SearchResult:
+    # A* when a heuristic is given, it must never overestimate the remaining distance
+    distance = [UNREACHED] * size
+    predecessor = [UNREACHED] * size
+    heap = []
+    expanded = 0
+
+    for source in sources:
+        distance[source] = 0
+        heap.append((heuristic(source) if heuristic else 0, 0, source))
+
+    heapq.heapify(heap)
+
+    while heap:
+        _, node_distance, node = heapq.heappop(heap)
+
+        # Stale entry, the node was reached with a shorter distance later
+        if node_distance != distance[node]:
+            continue
+
+        expanded += 1
+
+        if node == target:
+            break
+
+        for neighbour, weight in edges(node):
+            new_distance = node_distance + weight
+
+            if distance[neighbour] == UNREACHED or new_distance < distance[neighbour]:
+                distance[neighbour] = new_distance
+                predecessor[neighbour] = node
+                heapq.heappush(heap, (new_distance + (heuristic(neighbour) if heuristic else 0), new_distance, neighbour))
+
+    return search_result(distance, predecessor, expanded)
+
+
+def bucket_dijkstra(size: int, sources: Iterable[int], edges: Edges, max_weight: int, target: int | None = None) -> SearchResult:
+    # Dijkstra with a cyclic bucket queue for small integer weights, no heap operations
+    distance = [UNREACHED] * size
+    predecessor = [UNREACHED] * size
+    buckets = [[] for _ in range(max_weight + 1)]
+    pending = 0
+    expanded = 0
+
+    for source in sources:
+        distance[source] = 0
+        buckets[0].append(source)
+        pending += 1
+
+    current = 0
+    while pending:
+        bucket = buckets[current % len(buckets)]
+
+        while bucket:
+            node = bucket.pop()
+            pending -= 1
+
+            # Stale entry, the node was reached with a shorter distance later
+            if distance[node] != current:
+                continue
+
+            expanded += 1
+
+            if node == target:
+                return search_result(distance, predecessor, expanded)
+
+            for neighbour, weight in edges(node):
+                new_distance = current + weight
+
+                if distance[neighbour] == UNREACHED or new_distance < distance[neighbour]:
+                    distance[neighbour] = new_distance
+                    predecessor[neighbour] = node
+                    buckets[new_distance % len(buckets)].append(neighbour)
+                    pending += 1
+
+        current += 1
+
+    return search_result(distance, predecessor, expanded)
+
+
+# Memoized functions are registered, so their counters can be reported and their entries cleared per scope:
+# 'call' entries live for one puzzle call, 'input' entries as long as the puzzles run on the same input
+# (shared by puzzle_1 and puzzle_2), 'process' entries until they are evicted.
+type MemoScope = Literal['call', 'input', 'process']
+
+
+class MemoCache:
+    # Memos without a key function or byte limit are backed by functools.lru_cache, the others by a dict
+    __slots__ = ['name', 'scope', 'max_size', 'max_bytes', 'lru', 'entries', 'sizes', 'total_bytes', 'hits', 'misses', 'evictions']
+
+    def __init__(self, name: str, scope: MemoScope, max_size: int | None, max_bytes: int | None):
+        self.name = name
+        self.scope = scope
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.lru = None
+        self.entries: dict[object, object] = OrderedDict() if self.bounded else {}
+        self.sizes: dict[object, int] = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def bounded(self) -> bool:
+        return self.max_size is not None or self.max_bytes is not None
+
+    def put(self, key: object, value: object):
+        self.entries[key] = value
+
+        # Sizes are only estimated when there is a byte limit
+        if self.max_bytes is not None:
+            self.sizes[key] = estimate_size(key) + estimate_size(value)
+            self.total_bytes += self.sizes[key]
+
+        # Evict least recently used entries
+        while (
+                (self.max_size is not None and len(self.entries) > self.max_size)
+                or (self.max_bytes is not None and self.total_bytes > self.max_bytes)
+        ):
+            evicted, _ = self.entries.popitem(last=False)
+            self.total_bytes -= self.sizes.pop(evicted, 0)
+            self.evictions += 1
+
+    def clear(self, counters: bool = False):
+        if self.lru is not None:
+            # lru_cache resets its counters on clear, they are carried over first
+            self.hits, self.misses, self.evictions, _ = self.counters()
+            self.lru.cache_clear()
+
+        self.entries.clear()
+        self.sizes.clear()
+        self.total_bytes = 0
+
+        if counters:
+            self.hits = self.misses = self.evictions = 0
+
+    def counters(self) -> tuple[int, int, int, int]:
+        if self.lru is None:
+            return self.hits, self.misses, self.evictions, len(self.entries)
+
+        info = self.lru.cache_info()
+
+        # Every miss adds an entry, the ones that are gone were evicted
+        return self.hits + info.hits, self.misses + info.misses, self.evictions + info.misses - info.currsize, info.currsize
+
+    def stats(self) -> dict[str, int]:
+        hits, misses, evictions, size = self.counters()
+
+        return {
+            'hits': hits,
+            'misses': misses,
+            'evictions': evictions,
+            'size': size,
+            'bytes': self.total_bytes,
+        }
+
+
+MEMOS: list[MemoCache] = []
+
+# The last input is kept to detect a change of input, frozen slotted dataclasses can't be weakly referenced
+memo_input: object = None
+
+MISSING = object()
+
+
+def memo(
+        max_size: int | None = None,
+        max_bytes: int | None = None,
+        scope: MemoScope = 'process',
+        key: Callable[..., object] | None = None,
+):
+    def decorator(func: Callable) -> Callable:
+        cache = MemoCache(f'{func.__module__}.{func.__qualname__}', scope, max_size, max_bytes)
+        MEMOS.append(cache)
+
+        # Recursive calls go straight through the C implementation, no Python level wrapper per call
+        if key is None and max_bytes is None:
+            cache.lru = wrapper = functools.lru_cache(maxsize=max_size)(func)
+            wrapper.cache = cache
+            return wrapper
+
+        entries, put, bounded = cache.entries, cache.put, cache.bounded
+        key_of = key or (lambda *args: args)
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            cache_key = key_of(*args)
+            value = entries.get(cache_key, MISSING)
+
+            if value is MISSING:
+                cache.misses += 1
+                value = func(*args)
+                put(cache_key, value)
+            else:
+                cache.hits += 1
+
+                if bounded:
+                    entries.move_to_end(cache_key)
+
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def enter_memo_scope(data: object):
+    # Called before every puzzle with its input
+    global memo_input
+
+    for cache in MEMOS:
+        if cache.scope == 'call' or (cache.scope == 'input' and data is not memo_input):
+            cache.clear()
+
+    memo_input = data
+
+
+def clear_memos(scopes: Iterable[MemoScope] = ('call', 'input', 'process'), counters: bool = False):
+    for cache in MEMOS:
+        if cache.scope in scopes:
+            cache.clear(counters)
+
+
+def memo_stats() -> dict[str, dict[str, int]]:
+    return {cache.name: stats for cache in MEMOS if (stats := cache.stats())['hits'] or stats['misses']}